@@ -0,0 +1,34 @@
+-- Run history read path: indexes for latest-per-mode and per-repo timelines,
+-- plus the latest_comparison_runs summary table.
+-- Safe to re-run. Use `create index concurrently` by hand on large live tables.
+
+create index if not exists ix_comparison_runs_mode_created
+  on comparison_runs(mode, created_at desc);
+
+create index if not exists ix_change_analyses_repo_created
+  on change_analyses(repository_id, created_at desc);
+
+create index if not exists ix_release_events_repo_published
+  on release_events(repository_id, published_at desc nulls last);
+
+create table if not exists latest_comparison_runs (
+  mode text primary key,
+  comparison_run_id uuid not null references comparison_runs(id) on delete cascade,
+  criteria_weights jsonb not null,
+  repositories jsonb not null,
+  results jsonb not null,
+  created_at timestamptz not null
+);
+
+-- Backfill from existing history.
+insert into latest_comparison_runs (mode, comparison_run_id, criteria_weights, repositories, results, created_at)
+select distinct on (mode) mode, id, criteria_weights, repositories, results, created_at
+from comparison_runs
+order by mode, created_at desc
+on conflict (mode) do update
+set comparison_run_id = excluded.comparison_run_id,
+    criteria_weights = excluded.criteria_weights,
+    repositories = excluded.repositories,
+    results = excluded.results,
+    created_at = excluded.created_at
+where excluded.created_at >= latest_comparison_runs.created_at;
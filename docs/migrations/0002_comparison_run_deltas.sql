@@ -0,0 +1,17 @@
+-- Delta-encoded comparison runs: keyframe rows hold every result, delta rows hold only
+-- the results that changed since the previous run of the same mode.
+-- Existing rows become keyframes. Safe to re-run.
+
+alter table comparison_runs add column if not exists kind text not null default 'keyframe';
+alter table comparison_runs add column if not exists keyframe_id uuid references comparison_runs(id) on delete cascade;
+alter table comparison_runs add column if not exists removed jsonb not null default '[]'::jsonb;
+
+create index if not exists ix_comparison_runs_keyframe_created
+  on comparison_runs(keyframe_id, created_at);
+
+alter table latest_comparison_runs add column if not exists keyframe_id uuid references comparison_runs(id) on delete set null;
+alter table latest_comparison_runs add column if not exists runs_since_keyframe int not null default 0;
+
+update latest_comparison_runs
+set keyframe_id = comparison_run_id, runs_since_keyframe = 0
+where keyframe_id is null;
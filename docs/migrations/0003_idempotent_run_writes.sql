@@ -0,0 +1,10 @@
+-- Stable dedupe keys so retried/resumed worker runs never write an analysis or a
+-- comparison run twice. Existing rows keep a null key (nulls never conflict).
+
+alter table change_analyses add column if not exists dedupe_key text;
+create unique index if not exists ux_change_analyses_dedupe
+  on change_analyses(dedupe_key);
+
+alter table comparison_runs add column if not exists dedupe_key text;
+create unique index if not exists ux_comparison_runs_dedupe
+  on comparison_runs(dedupe_key);
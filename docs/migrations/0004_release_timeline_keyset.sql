@@ -0,0 +1,7 @@
+-- Release timelines page on (published_at, id) so ties and undated releases are reachable.
+-- Replaces ix_release_events_repo_published from 0001.
+
+create index if not exists ix_release_events_repo_published_id
+  on release_events(repository_id, published_at desc nulls last, id desc);
+
+drop index if exists ix_release_events_repo_published;
@@ -0,0 +1,7 @@
+-- Analysis timelines page on (created_at, id): a repo's analyses are inserted in one
+-- transaction and share created_at. Replaces ix_change_analyses_repo_created from 0001.
+
+create index if not exists ix_change_analyses_repo_created_id
+  on change_analyses(repository_id, created_at desc, id desc);
+
+drop index if exists ix_change_analyses_repo_created;
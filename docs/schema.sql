@@ -41,6 +41,9 @@ create table if not exists release_events (
 create unique index if not exists ux_release_events_repo_source
   on release_events(repository_id, source_url);
 
+create index if not exists ix_release_events_repo_published_id
+  on release_events(repository_id, published_at desc nulls last, id desc);
+
 create table if not exists change_analyses (
   id uuid primary key default gen_random_uuid(),
   repository_id uuid not null references repositories(id) on delete cascade,
@@ -52,9 +55,16 @@ create table if not exists change_analyses (
   confidence numeric(4,3) not null,
   rationale text not null,
   model text not null,
-  created_at timestamptz not null default now()
+  created_at timestamptz not null default now(),
+  dedupe_key text
 );
 
+create unique index if not exists ux_change_analyses_dedupe
+  on change_analyses(dedupe_key);
+
+create index if not exists ix_change_analyses_repo_created_id
+  on change_analyses(repository_id, created_at desc, id desc);
+
 create table if not exists users (
   id uuid primary key default gen_random_uuid(),
   email text not null unique,
@@ -70,7 +80,33 @@ create table if not exists comparison_runs (
   repositories jsonb not null,
   results jsonb not null,
   created_by_user_id uuid references users(id) on delete set null,
-  created_at timestamptz not null default now()
+  created_at timestamptz not null default now(),
+  -- keyframe: results holds every row; delta: results holds changed rows since the previous run
+  kind text not null default 'keyframe',
+  keyframe_id uuid references comparison_runs(id) on delete cascade,
+  removed jsonb not null default '[]'::jsonb,
+  dedupe_key text
+);
+
+create unique index if not exists ux_comparison_runs_dedupe
+  on comparison_runs(dedupe_key);
+
+create index if not exists ix_comparison_runs_mode_created
+  on comparison_runs(mode, created_at desc);
+
+create index if not exists ix_comparison_runs_keyframe_created
+  on comparison_runs(keyframe_id, created_at);
+
+-- One row per mode, kept in sync by the worker on every comparison run insert.
+create table if not exists latest_comparison_runs (
+  mode text primary key,
+  comparison_run_id uuid not null references comparison_runs(id) on delete cascade,
+  criteria_weights jsonb not null,
+  repositories jsonb not null,
+  results jsonb not null,
+  created_at timestamptz not null,
+  keyframe_id uuid references comparison_runs(id) on delete set null,
+  runs_since_keyframe int not null default 0
 );
 
 create table if not exists subscriptions (
@@ -0,0 +1,144 @@
+"""p50/p99 latency of POST /api/compare under concurrent clients: rescoring raw analyses per
+request vs the memoized ComparisonService.
+
+Usage (from repo root):
+
+    python -m workers.scripts.bench_compare_service --repos 500 --analyses-per-repo 200 --clients 16
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from statistics import median, quantiles
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from workers.src.analysis.compare_service import ComparisonService
+from workers.src.analysis.comparison import build_comparison_run
+from workers.src.common.store import JsonlStore
+from workers.src.compare_server import serve
+
+MODES = ["executive", "technical", "security", "usecase"]
+
+
+class RescoreEveryRequest:
+    """Baseline: regroup and rescore raw analyses on every request."""
+
+    stats: Dict[str, int] = {}
+
+    def __init__(self, rows: List[Dict[str, Any]]) -> None:
+        self.rows = rows
+
+    def refresh(self) -> int:
+        return 0
+
+    def compare(self, repo_urls: List[str], mode: str = "executive", weights: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        wanted = set(repo_urls)
+        return build_comparison_run(mode=mode, rows=[r for r in self.rows if r["repo_url"] in wanted])
+
+
+def seed(store: JsonlStore, repos: int, per_repo: int, rng: random.Random) -> List[str]:
+    urls = [f"https://github.com/bench/repo{i}" for i in range(repos)]
+    for url in urls:
+        for _ in range(per_repo):
+            store.append_raw(
+                "change_analyses",
+                {
+                    "repo_url": url,
+                    "change_type": rng.choice(["feature", "fix", "security", "docs", "other"]),
+                    "summary": "Synthetic change analysis",
+                    "impact_level": rng.choice(["low", "medium", "high"]),
+                    "confidence": round(rng.random(), 3),
+                    "rationale": "Synthetic rationale",
+                    "model": "bench",
+                },
+            )
+    store.flush()
+    return urls
+
+
+def run_load(service: Any, urls: List[str], requests: int, clients: int, hot_sets: int, seed_value: int) -> List[float]:
+    server = serve(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/api/compare"
+
+    rng = random.Random(seed_value)
+    # Dashboard-like traffic: most requests hit a small set of popular comparisons.
+    popular = [rng.sample(urls, rng.randint(2, 8)) for _ in range(hot_sets)]
+    payloads = []
+    for _ in range(requests):
+        repos = rng.choice(popular) if rng.random() < 0.8 else rng.sample(urls, rng.randint(2, 8))
+        payloads.append({"repositories": repos, "mode": rng.choice(MODES)})
+
+    local = threading.local()
+
+    def one(payload: Dict[str, Any]) -> float:
+        if not hasattr(local, "client"):
+            local.client = httpx.Client(timeout=30.0)
+        start = time.perf_counter()
+        resp = local.client.post(endpoint, json=payload)
+        resp.raise_for_status()
+        return (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        latencies = list(pool.map(one, payloads))
+    server.shutdown()
+    return latencies
+
+
+def report(label: str, latencies: List[float]) -> None:
+    p99 = quantiles(latencies, n=100)[-1]
+    print(f"{label:<22} p50={median(latencies):7.2f}ms p99={p99:7.2f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repos", type=int, default=500)
+    parser.add_argument("--analyses-per-repo", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--hot-sets", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = JsonlStore(base_dir=tmp, buffered=True)
+        urls = seed(store, args.repos, args.analyses_per_repo, random.Random(args.seed))
+        rows = store.read_all("change_analyses")
+        print(f"repos={args.repos} analyses={len(rows)} requests={args.requests} clients={args.clients}")
+
+        baseline = RescoreEveryRequest(rows)
+        report("rescore per request", run_load(baseline, urls, args.requests, args.clients, args.hot_sets, args.seed))
+
+        service = ComparisonService.from_store(store)
+        report("memoized service", run_load(service, urls, args.requests, args.clients, args.hot_sets, args.seed))
+        print(f"service stats {service.stats}")
+
+        # In-process cost without HTTP (client and server above share one interpreter).
+        rng = random.Random(args.seed + 1)
+        direct = []
+        for _ in range(args.requests):
+            repos = rng.sample(urls, rng.randint(2, 8))
+            start = time.perf_counter()
+            service.compare(repos, rng.choice(MODES))
+            direct.append((time.perf_counter() - start) * 1000)
+        report("in-process, cold sets", direct)
+
+        # Correctness: memoized answers match a fresh rescoring.
+        for repos in (urls[:5], urls[10:12]):
+            for mode in MODES:
+                expected = baseline.compare(repos, mode)["results"]
+                got = service.compare(repos, mode)["results"]
+                assert [(r["repo_url"], r["score"], r["rank"]) for r in got] == [
+                    (r["repo_url"], r["score"], r["rank"]) for r in expected
+                ]
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
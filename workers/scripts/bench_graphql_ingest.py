@@ -0,0 +1,195 @@
+"""Compare the batched GraphQL ingestor against the page-scraping path on local stand-ins.
+
+Serves GitHub-shaped repo/releases pages and a GraphQL endpoint that answers aliased
+`repository` lookups from 127.0.0.1, both with the same per-request latency. Runs both
+ingestors over the same repos, checks that branch/release fields agree, and reports requests,
+wall-clock and query cost per 1000 repos.
+
+Usage (from repo root):
+
+    python -m workers.scripts.bench_graphql_ingest --repos 1000 --latency-ms 10
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from workers.scripts.bench_streaming_fetch import releases_page, repo_page
+from workers.src.ingestion.base import Ingestor
+from workers.src.ingestion.github_graphql import GitHubGraphQLIngestor
+from workers.src.ingestion.scrapling_github import GitHubScraplingIngestor
+
+REPO_PATH_RE = re.compile(r"^/acme/widget(?P<i>\d+)(?P<releases>/releases)?$")
+
+
+def graphql_node(i: int) -> dict:
+    # Mirrors what repo_page(i) / releases_page(i) render, but with a real date per release.
+    return {
+        "stargazerCount": 1000 + i,
+        "forkCount": 200 + i,
+        "issues": {"totalCount": 30 + i},
+        "defaultBranchRef": {"name": "main"},
+        "releases": {
+            "nodes": [
+                {
+                    "tagName": f"v{i}.{n}.0",
+                    "name": f"v{i}.{n}.0",
+                    "publishedAt": f"2026-0{1 + n % 9}-{1 + n:02d}T00:00:00Z",
+                    "url": f"https://github.com/acme/widget{i}/releases/tag/v{i}.{n}.0",
+                }
+                for n in range(10)
+            ]
+        },
+    }
+
+
+class QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address) -> None:
+        # The streaming scraper hangs up as soon as it has its fields; that is expected here.
+        pass
+
+
+def serve(distinct: int, latency: float, node_latency: float) -> ThreadingHTTPServer:
+    pages = {}
+    for i in range(distinct):
+        pages[(i, False)] = repo_page(i).encode("utf-8")
+        pages[(i, True)] = releases_page(i).encode("utf-8")
+    nodes = {i: graphql_node(i) for i in range(distinct)}
+    budget = {"remaining": 5000}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self) -> None:
+            m = REPO_PATH_RE.match(self.path)
+            if not m:
+                self._send(404, b"", "text/plain")
+                return
+            time.sleep(latency)
+            self._send(200, pages[(int(m.group("i")) % distinct, bool(m.group("releases")))], "text/html; charset=utf-8")
+
+        def do_POST(self) -> None:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            variables = body["variables"]
+            count = len(variables) // 2
+            time.sleep(latency + node_latency * count)
+            data = {}
+            for k in range(count):
+                name = variables[f"n{k}"]
+                data[f"r{k}"] = nodes[int(name.removeprefix("widget")) % distinct] if name.startswith("widget") else None
+            # GitHub charges ~1 point per 100 connection lookups (repository + releases + issues).
+            cost = max(1, math.ceil(2 * count / 100))
+            with lock:
+                budget["remaining"] -= cost
+                data["rateLimit"] = {"cost": cost, "remaining": budget["remaining"], "resetAt": "2099-01-01T00:00:00Z"}
+            self._send(200, json.dumps({"data": data}).encode("utf-8"), "application/json")
+
+        def _send(self, status: int, body: bytes, content_type: str) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = QuietServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class LocalTransport(httpx.BaseTransport):
+    """Sends github.com requests to the local stand-in so the real ingestors run unchanged."""
+
+    def __init__(self, port: int) -> None:
+        self.port = port
+        self.inner = httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.url = request.url.copy_with(scheme="http", host="127.0.0.1", port=self.port)
+        return self.inner.handle_request(request)
+
+
+class CountingTransport(LocalTransport):
+    def __init__(self, port: int) -> None:
+        super().__init__(port)
+        self.requests = 0
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        return super().handle_request(request)
+
+
+def run(ingestor: Ingestor, repo_urls: list[str]) -> tuple[list, float]:
+    start = time.perf_counter()
+    ingestor.prefetch(repo_urls)
+    rows = []
+    for url in repo_urls:
+        snapshot = ingestor.fetch_snapshot(url)
+        releases = ingestor.fetch_releases(url)
+        rows.append((snapshot, releases))
+    return rows, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repos", type=int, default=1000)
+    parser.add_argument("--distinct-pages", type=int, default=20, help="distinct page bodies served (memory bound)")
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="added per request on both stand-ins")
+    parser.add_argument("--node-latency-ms", type=float, default=2.0, help="added per repo in a GraphQL batch")
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+
+    server = serve(args.distinct_pages, args.latency_ms / 1000, args.node_latency_ms / 1000)
+    port = server.server_address[1]
+    repo_urls = [f"https://github.com/acme/widget{i}" for i in range(args.repos)]
+    per_k = 1000 / args.repos
+
+    scrape_transport = CountingTransport(port)
+    scraper = GitHubScraplingIngestor(streaming=True)
+    scraper.client = httpx.Client(timeout=30.0, transport=scrape_transport)
+    scraped, scrape_s = run(scraper, repo_urls)
+
+    graphql = GitHubGraphQLIngestor("local-token", batch_size=args.batch_size, url="https://api.github.com/graphql")
+    graphql.client = httpx.Client(timeout=60.0, transport=LocalTransport(port), headers=graphql.client.headers)
+    batched, graphql_s = run(graphql, repo_urls)
+
+    count_mismatches = 0
+    for (s_snap, s_rel), (g_snap, g_rel) in zip(scraped, batched):
+        for field in ("default_branch", "latest_release_tag"):
+            assert getattr(s_snap, field) == getattr(g_snap, field), f"{s_snap.repo_url}: {field} differs"
+        assert [r.version for r in s_rel] == [r.version for r in g_rel], f"{s_snap.repo_url}: release tags differ"
+        # The page heuristic takes the first number near "stargazers"/"forks", which can be a digit in the repo name.
+        count_mismatches += (s_snap.stars, s_snap.forks) != (g_snap.stars, g_snap.forks)
+
+    scrape_dates = sum(len({r.published_at for r in rel}) for _, rel in scraped) / args.repos
+    graphql_dates = sum(len({r.published_at for r in rel}) for _, rel in batched) / args.repos
+    print(f"repos={args.repos} latency={args.latency_ms}ms batch_size={args.batch_size} (per 1000 repos)")
+    print(
+        f"scrape:  requests={scrape_transport.requests * per_k:7.0f}  wall={scrape_s * per_k:7.2f}s  distinct_published_at/repo={scrape_dates:.1f}  "
+        f"star/fork counts differing from graphql={count_mismatches}/{args.repos}"
+    )
+    print(
+        f"graphql: requests={graphql.requests * per_k:7.0f}  wall={graphql_s * per_k:7.2f}s  distinct_published_at/repo={graphql_dates:.1f}  "
+        f"cost={graphql.cost_spent * per_k:.0f} remaining={graphql.rate_limit.get('remaining')}"
+    )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
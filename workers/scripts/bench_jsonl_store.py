@@ -0,0 +1,56 @@
+"""Compare JsonlStore append throughput: per-row open/close vs buffered group commit.
+
+Usage (from repo root):
+
+    python -m workers.scripts.bench_jsonl_store --rows 20000
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+
+from workers.src.common.store import JsonlStore
+
+STREAMS = ["repository_snapshots", "release_events", "normalized_events", "change_analyses"]
+
+
+def _row(i: int) -> dict:
+    return {
+        "repo_url": f"https://github.com/bench/repo{i % 500}",
+        "change_type": "feature",
+        "summary": "Synthetic change analysis row for benchmarking",
+        "impact_level": "low",
+        "confidence": 0.5,
+        "rationale": "Synthetic rationale text",
+        "model": "bench",
+    }
+
+
+def run(label: str, rows: int, **store_kwargs) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = JsonlStore(base_dir=tmp, **store_kwargs)
+        start = time.perf_counter()
+        for i in range(rows):
+            store.append_raw(STREAMS[i % len(STREAMS)], _row(i))
+        store.close()
+        elapsed = time.perf_counter() - start
+        written = sum(len(store.read_all(s)) for s in STREAMS)
+        assert written == rows, (written, rows)
+    print(f"{label:<36} {rows / elapsed:>12,.0f} appends/s  ({elapsed:.3f}s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    run("unbuffered (open/close per row)", args.rows)
+    run("buffered fsync=none", args.rows, buffered=True, fsync="none")
+    run("buffered fsync=batch", args.rows, buffered=True, fsync="batch")
+    run("buffered fsync=close", args.rows, buffered=True, fsync="close")
+    run("background fsync=batch", args.rows, background=True, fsync="batch")
+
+
+if __name__ == "__main__":
+    main()
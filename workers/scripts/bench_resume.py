@@ -0,0 +1,161 @@
+"""Kill a worker run mid-flight, resume it, and check exactly-once outputs and time saved.
+
+The child process runs the real pipeline (`run_ingestion`) with a slow in-process ingestor and
+analyzer standing in for GitHub and OpenAI. The parent SIGKILLs it once a given number of repos
+are checkpointed, resumes, and compares against an uninterrupted run.
+
+Usage (from repo root):
+
+    python -m workers.scripts.bench_resume --repos 60 --kill-after 40
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+RELEASES_PER_REPO = 3
+
+
+def child(delay: float) -> None:
+    import workers.src.main as worker
+    from workers.src.analysis.schema import ChangeAnalysisResult
+    from workers.src.common.models import ReleaseEvent, RepositorySnapshot
+
+    class SlowIngestor:
+        def __init__(self, **_: object) -> None:
+            pass
+
+        def prefetch(self, repo_urls: list[str]) -> None:
+            pass
+
+        def close(self) -> None:
+            pass
+
+        def fetch_snapshot(self, repo_url: str) -> RepositorySnapshot:
+            time.sleep(delay)
+            return RepositorySnapshot(repo_url=repo_url, captured_at=datetime.now(timezone.utc), stars=len(repo_url))
+
+        def fetch_releases(self, repo_url: str) -> list[ReleaseEvent]:
+            time.sleep(delay)
+            return [
+                ReleaseEvent(repo_url=repo_url, version=f"v{i}", title=f"Release v{i}", source_url=f"{repo_url}/releases/tag/v{i}")
+                for i in range(RELEASES_PER_REPO)
+            ]
+
+    class SlowAnalyzer:
+        def __init__(self, *_: object) -> None:
+            pass
+
+        def analyze_change(self, title: str, body: str, source_url: str) -> ChangeAnalysisResult:
+            time.sleep(delay)
+            return ChangeAnalysisResult(
+                change_type="feature" if hash(source_url) % 2 else "fix",
+                summary=f"Detected update: {title}",
+                impact_level="medium",
+                confidence=0.5,
+                rationale=f"Synthetic analysis for {source_url}",
+                model="bench-slow",
+            )
+
+    worker.GitHubScraplingIngestor = SlowIngestor
+    worker.OpenAIAnalyzer = SlowAnalyzer
+    worker.run_ingestion()
+
+
+def spawn(workdir: Path, repos: int, delay: float) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(ROOT),
+        "MONITORED_REPOS": ",".join(f"https://github.com/bench/repo{i}" for i in range(repos)),
+        "DATABASE_URL": "",
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "workers.scripts.bench_resume", "--child", "--delay", str(delay)],
+        cwd=workdir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def persisted_count(data: Path) -> int:
+    runs = list((data / "runs").glob("*.jsonl")) if (data / "runs").exists() else []
+    if not runs:
+        return 0
+    return sum(1 for line in runs[0].read_text().splitlines() if '"stage": "persisted"' in line)
+
+
+def read(data: Path, name: str) -> list[dict]:
+    path = data / f"{name}.jsonl"
+    return [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+
+
+def verify(data: Path, repos: int) -> None:
+    analyses = read(data, "change_analyses")
+    keys = Counter(a["dedupe_key"] for a in analyses)
+    assert len(keys) == repos * RELEASES_PER_REPO, len(keys)
+    assert max(keys.values()) == 1, "duplicate analyses"
+    snapshots = Counter(s["repo_url"] for s in read(data, "repository_snapshots"))
+    assert len(snapshots) == repos and max(snapshots.values()) == 1, "duplicate snapshots"
+    assert len(read(data, "release_events")) == repos * RELEASES_PER_REPO
+    runs = read(data, "comparison_runs")
+    assert sorted(r["mode"] for r in runs) == ["executive", "security", "technical", "usecase"], runs
+    assert all(len(r["results"]) == repos for r in runs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repos", type=int, default=60)
+    parser.add_argument("--kill-after", type=int, default=40, help="SIGKILL once this many repos are checkpointed")
+    parser.add_argument("--delay", type=float, default=0.02, help="seconds per fetch/analysis call")
+    parser.add_argument("--child", action="store_true")
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.delay)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        full_dir = Path(tmp) / "full"
+        full_dir.mkdir()
+        start = time.perf_counter()
+        assert spawn(full_dir, args.repos, args.delay).wait() == 0
+        full_time = time.perf_counter() - start
+
+        crash_dir = Path(tmp) / "crash"
+        crash_dir.mkdir()
+        data = crash_dir / "workers" / ".data"
+        start = time.perf_counter()
+        proc = spawn(crash_dir, args.repos, args.delay)
+        while persisted_count(data) < args.kill_after:
+            time.sleep(0.005)
+        # Land mid-repo so the resume has to drop rows written after the last checkpoint.
+        time.sleep(args.delay * 3.5)
+        proc.send_signal(signal.SIGKILL)
+        proc.wait()
+        before_kill = time.perf_counter() - start
+        done_at_kill = persisted_count(data)
+
+        start = time.perf_counter()
+        assert spawn(crash_dir, args.repos, args.delay).wait() == 0
+        resume_time = time.perf_counter() - start
+
+        verify(full_dir / "workers" / ".data", args.repos)
+        verify(data, args.repos)
+        print(f"repos={args.repos} killed_after={done_at_kill} repos checkpointed ({before_kill:.2f}s in)")
+        print(f"uninterrupted run {full_time:.2f}s | resume {resume_time:.2f}s | restart-from-scratch would be {full_time:.2f}s")
+        print(f"time saved by resuming: {full_time - resume_time:.2f}s ({(1 - resume_time / full_time) * 100:.0f}%)")
+        print("exactly-once: analyses, snapshots, releases and comparison runs verified")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Storage size and history-scan cost of full vs keyframe+delta comparison run records.
+
+Simulates a year of runs for every mode with small score drift per run, writes both formats
+as JSONL, checks that every run reconstructs exactly and that rank shifts read from the
+stored records match detect_rank_shifts on full results.
+
+Usage (from repo root):
+
+    python -m workers.scripts.bench_run_deltas --repos 300 --runs-per-day 4
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from workers.src.analysis.comparison import MODE_WEIGHTS
+from workers.src.analysis.rank_shift import detect_rank_shifts, detect_rank_shifts_from_record
+from workers.src.analysis.run_delta import encode_comparison_run, next_run_state, reconstruct_run, replay_runs
+
+
+def simulate(repos: int, runs: int, drift: float, seed: int):
+    rng = random.Random(seed)
+    scores = {mode: {f"https://github.com/bench/repo{i}": rng.uniform(2, 8) for i in range(repos)} for mode in MODE_WEIGHTS}
+    for _ in range(runs):
+        for mode, by_repo in scores.items():
+            for url in rng.sample(list(by_repo), max(1, int(repos * drift))):
+                by_repo[url] = round(min(10.0, max(0.0, by_repo[url] + rng.uniform(-0.3, 0.3))), 3)
+            rows = [
+                {"repo_url": url, "score": round(score, 3), "confidence": 0.8, "sample_size": 10, "security_ratio": 0.1, "feature_ratio": 0.4}
+                for url, score in by_repo.items()
+            ]
+            rows.sort(key=lambda r: r["score"], reverse=True)
+            for rank, row in enumerate(rows, start=1):
+                row["rank"] = rank
+            yield {"mode": mode, "criteriaWeights": MODE_WEIGHTS[mode], "repositories": list(by_repo), "results": rows}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repos", type=int, default=300)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--runs-per-day", type=int, default=4)
+    parser.add_argument("--drift", type=float, default=0.02, help="fraction of repos whose score moves per run")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    runs = args.days * args.runs_per_day
+    with tempfile.TemporaryDirectory() as tmp:
+        full_path = Path(tmp) / "full.jsonl"
+        delta_path = Path(tmp) / "delta.jsonl"
+        states = {}
+        keyframes = 0
+        with full_path.open("w") as full_f, delta_path.open("w") as delta_f:
+            for comparison in simulate(args.repos, runs, args.drift, args.seed):
+                full_f.write(json.dumps(comparison) + "\n")
+                record = encode_comparison_run(comparison, states.get(comparison["mode"]))
+                keyframes += record["kind"] == "keyframe"
+                states[comparison["mode"]] = next_run_state(states.get(comparison["mode"]), record)
+                delta_f.write(json.dumps(record) + "\n")
+
+        full_size = full_path.stat().st_size
+        delta_size = delta_path.stat().st_size
+        total = runs * len(MODE_WEIGHTS)
+        print(f"runs={total} repos={args.repos} keyframes={keyframes}")
+        print(f"storage full={full_size / 2**20:.1f} MiB delta={delta_size / 2**20:.1f} MiB ({full_size / delta_size:.1f}x smaller)")
+
+        # History scan: rank shifts for every run of every mode.
+        start = time.perf_counter()
+        previous = {}
+        full_shifts = []
+        with full_path.open() as f:
+            for line in f:
+                run = json.loads(line)
+                prev = previous.get(run["mode"])
+                full_shifts.append(detect_rank_shifts(prev, run["results"]) if prev else [])
+                previous[run["mode"]] = run["results"]
+        full_scan = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with delta_path.open() as f:
+            delta_shifts = [detect_rank_shifts_from_record(json.loads(line)["results"]) for line in f]
+        delta_scan = time.perf_counter() - start
+        assert full_shifts == delta_shifts, "rank shifts differ between formats"
+        print(f"rank-shift history scan full={full_scan:.2f}s delta={delta_scan:.2f}s ({full_scan / delta_scan:.1f}x faster)")
+
+        # Reconstruction: every run matches, and a random run rebuilds from its keyframe only.
+        with full_path.open() as f:
+            originals = [json.loads(line)["results"] for line in f]
+        with delta_path.open() as f:
+            records = [json.loads(line) for line in f]
+        for original, (_, state) in zip(originals, replay_runs(records)):
+            assert state["results"] == original, "reconstructed run differs"
+
+        rng = random.Random(args.seed)
+        start = time.perf_counter()
+        for _ in range(100):
+            reconstruct_run(records, "executive", rng.randrange(runs))
+        print(f"random-run reconstruct (records in memory) {(time.perf_counter() - start) * 10:.2f} ms/run")
+
+
+if __name__ == "__main__":
+    main()
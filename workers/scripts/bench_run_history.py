@@ -0,0 +1,179 @@
+"""Seed a local Postgres with synthetic run history and time the read path.
+
+Usage (from repo root, against a throwaway database with docs/schema.sql applied):
+
+    DATABASE_URL=postgresql://localhost/clawstrack_bench python -m workers.scripts.bench_run_history --repos 2000 --runs 50000
+
+Prints EXPLAIN (ANALYZE, BUFFERS) for each query, then median/p95 latency.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from statistics import median, quantiles
+
+import psycopg
+
+from workers.src.common.queries import (
+    fetch_change_analysis_timeline,
+    fetch_latest_comparison_run,
+    fetch_latest_comparison_runs,
+    fetch_release_timeline,
+)
+
+MODES = ["executive", "technical", "security", "usecase"]
+
+
+def seed(conn: psycopg.Connection, repos: int, runs: int, analyses_per_repo: int, releases_per_repo: int) -> None:
+    with conn.cursor() as cur:
+        print(f"seeding repos={repos} runs={runs * len(MODES)} analyses={repos * analyses_per_repo} releases={repos * releases_per_repo}")
+        cur.execute(
+            """
+            insert into repositories (url, owner, name)
+            select 'https://github.com/bench/repo' || g, 'bench', 'repo' || g
+            from generate_series(1, %s) g
+            on conflict (url) do nothing
+            """,
+            (repos,),
+        )
+        cur.execute(
+            """
+            insert into change_analyses (repository_id, change_type, summary, impact_level, confidence, rationale, model, created_at)
+            select r.id, 'feature', 'Synthetic analysis row', 'low', 0.5, 'Synthetic rationale', 'bench',
+                   now() - (g || ' minutes')::interval
+            from repositories r cross join generate_series(1, %s) g
+            where r.owner = 'bench'
+            """,
+            (analyses_per_repo,),
+        )
+        cur.execute(
+            """
+            insert into release_events (repository_id, version, published_at, title, source_url)
+            select r.id, 'v' || g, now() - (g || ' hours')::interval, 'Release v' || g, r.url || '/releases/tag/v' || g
+            from repositories r cross join generate_series(1, %s) g
+            where r.owner = 'bench'
+            on conflict do nothing
+            """,
+            (releases_per_repo,),
+        )
+        cur.execute(
+            """
+            insert into comparison_runs (mode, criteria_weights, repositories, results, created_at)
+            select m, '{}'::jsonb, '[]'::jsonb, '[]'::jsonb, now() - (g || ' minutes')::interval
+            from unnest(%s::text[]) m cross join generate_series(1, %s) g
+            """,
+            (MODES, runs),
+        )
+        cur.execute(
+            """
+            insert into latest_comparison_runs (mode, comparison_run_id, criteria_weights, repositories, results, created_at)
+            select distinct on (mode) mode, id, criteria_weights, repositories, results, created_at
+            from comparison_runs order by mode, created_at desc
+            on conflict (mode) do nothing
+            """
+        )
+        cur.execute("analyze")
+    conn.commit()
+
+
+class _ExplainCursor:
+    def __init__(self, cur: psycopg.Cursor, plans: list) -> None:
+        self._cur = cur
+        self._plans = plans
+
+    def __enter__(self) -> "_ExplainCursor":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._cur.close()
+
+    def execute(self, query: str, params: tuple = ()) -> None:
+        self._cur.execute("explain (analyze, buffers) " + query, params)
+        self._plans.append([line for (line,) in self._cur.fetchall()])
+
+    def fetchone(self) -> None:
+        return None
+
+    def fetchall(self) -> list:
+        return []
+
+
+class ExplainConnection:
+    """Stands in for the connection so a query function's real SQL is EXPLAINed, not a copy of it.
+
+    Every statement returns no rows, so fallback branches (and the release timeline's undated
+    tail) are explained too.
+    """
+
+    def __init__(self, conn: psycopg.Connection) -> None:
+        self.conn = conn
+        self.plans: list = []
+
+    def cursor(self, *args: object, **kwargs: object) -> _ExplainCursor:
+        return _ExplainCursor(self.conn.cursor(), self.plans)
+
+
+def explain(conn: psycopg.Connection, label: str, fn) -> None:
+    proxy = ExplainConnection(conn)
+    fn(proxy)
+    for i, plan in enumerate(proxy.plans, 1):
+        print(f"\n-- {label} [statement {i}/{len(proxy.plans)}]")
+        for line in plan:
+            print(line)
+
+
+def timed(label: str, fn, iterations: int) -> None:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    p95 = quantiles(samples, n=20)[-1]
+    print(f"{label:<32} median={median(samples):.3f}ms p95={p95:.3f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repos", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=50000, help="runs per mode")
+    parser.add_argument("--analyses-per-repo", type=int, default=1000)
+    parser.add_argument("--releases-per-repo", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args()
+
+    with psycopg.connect(os.environ["DATABASE_URL"]) as conn:
+        if not args.skip_seed:
+            seed(conn, args.repos, args.runs, args.analyses_per_repo, args.releases_per_repo)
+
+        with conn.cursor() as cur:
+            cur.execute("select id from repositories where owner = 'bench' limit 1")
+            repo_id = str(cur.fetchone()[0])
+
+        analyses = fetch_change_analysis_timeline(conn, repo_id)
+        releases = fetch_release_timeline(conn, repo_id)
+        analysis_cursor = {"before": analyses[-1]["created_at"], "before_id": analyses[-1]["id"]}
+        release_cursor = {"before": releases[-1]["published_at"], "before_id": releases[-1]["id"]}
+
+        explain(conn, "latest run, one mode (summary table, then index fallback)", lambda c: fetch_latest_comparison_run(c, "executive"))
+        explain(conn, "latest runs, all modes (summary table, then missing-mode fallback)", fetch_latest_comparison_runs)
+        explain(conn, "analysis timeline, first page", lambda c: fetch_change_analysis_timeline(c, repo_id))
+        explain(conn, "analysis timeline, keyset page", lambda c: fetch_change_analysis_timeline(c, repo_id, **analysis_cursor))
+        explain(conn, "release timeline, first page", lambda c: fetch_release_timeline(c, repo_id))
+        explain(conn, "release timeline, keyset page", lambda c: fetch_release_timeline(c, repo_id, **release_cursor))
+
+        print()
+        timed("latest_comparison_run", lambda: fetch_latest_comparison_run(conn, "executive"), args.iterations)
+        timed("change_analysis_timeline", lambda: fetch_change_analysis_timeline(conn, repo_id), args.iterations)
+        timed("release_timeline", lambda: fetch_release_timeline(conn, repo_id), args.iterations)
+        timed(
+            "change_analysis_timeline keyset",
+            lambda: fetch_change_analysis_timeline(conn, repo_id, **analysis_cursor),
+            args.iterations,
+        )
+        timed("release_timeline keyset", lambda: fetch_release_timeline(conn, repo_id, **release_cursor), args.iterations)
+
+
+if __name__ == "__main__":
+    main()
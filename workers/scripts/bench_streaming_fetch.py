@@ -0,0 +1,164 @@
+"""Compare full-body vs streaming page parsing against a local HTTP stand-in.
+
+Serves GitHub-shaped repo and releases pages from 127.0.0.1, checks that the streaming
+extractors return the same fields as the full-page selectors, and reports bytes read,
+latency and peak traced memory per request.
+
+Usage (from repo root):
+
+    python -m workers.scripts.bench_streaming_fetch --pages 50
+"""
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from statistics import median
+
+import httpx
+
+from workers.src.ingestion.selectors import (
+    RELEASE_CARD_RE,
+    extract_default_branch,
+    extract_first_datetime,
+    extract_latest_release_tag,
+    extract_social_count,
+)
+from workers.src.ingestion.streaming import ReleaseListExtractor, SnapshotExtractor, stream_extract
+
+ASSET_PADDING = '<link rel="stylesheet" href="https://github.githubassets.com/assets/x.css" />\n' * 500
+FILE_ROW = '<div role="row" class="Box-row"><a href="/acme/widget/blob/main/src/file{i}.py">file{i}.py</a></div>\n'
+
+
+def repo_page(i: int) -> str:
+    rows = "".join(FILE_ROW.format(i=n) for n in range(3000))
+    return (
+        f"<html><head>{ASSET_PADDING}</head><body>"
+        f'<a href="/acme/widget{i}/tree/main">main</a>'
+        f'<a href="/acme/widget{i}/stargazers"><span class="Counter">{1000 + i:,}</span> stargazers</a>'
+        f'<a href="/acme/widget{i}/forks"><span class="Counter">{200 + i}</span> forks</a>'
+        f'<a href="/acme/widget{i}/releases/tag/v{i}.0.0">Latest</a>'
+        f"{rows}</body></html>"
+    )
+
+
+def releases_page(i: int) -> str:
+    cards = "".join(
+        f'<section><relative-time datetime="2026-0{1 + n % 9}-01T00:00:00Z"></relative-time>'
+        f'<a href="/acme/widget{i}/releases/tag/v{i}.{n}.0">v{i}.{n}.0</a>'
+        f'<div class="markdown-body">{"Release notes line. " * 600}</div></section>'
+        for n in range(25)
+    )
+    return f"<html><head>{ASSET_PADDING}</head><body>{cards}</body></html>"
+
+
+def serve(pages: int) -> ThreadingHTTPServer:
+    bodies = {}
+    for i in range(pages):
+        bodies[f"/acme/widget{i}"] = repo_page(i).encode("utf-8")
+        bodies[f"/acme/widget{i}/releases"] = releases_page(i).encode("utf-8")
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            body = bodies.get(self.path)
+            if body is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            try:
+                for start in range(0, len(body), 16384):
+                    self.wfile.write(body[start:start + 16384])
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def full_snapshot(client: httpx.Client, url: str) -> tuple:
+    html = client.get(url).text
+    return (
+        extract_default_branch(html),
+        extract_social_count(html, "stargazers"),
+        extract_social_count(html, "forks"),
+        extract_latest_release_tag(html),
+    ), len(html.encode("utf-8"))
+
+
+def full_releases(client: httpx.Client, url: str) -> tuple:
+    html = client.get(url).text
+    seen = []
+    for m in RELEASE_CARD_RE.finditer(html):
+        pair = (m.group("tag"), m.group("href"))
+        if pair not in seen:
+            seen.append(pair)
+    return (seen[:10], extract_first_datetime(html)), len(html.encode("utf-8"))
+
+
+def stream_snapshot(client: httpx.Client, url: str) -> tuple:
+    ex = SnapshotExtractor()
+    stats = stream_extract(client, url, ex)
+    return (ex.default_branch, ex.counts["stargazers"], ex.counts["forks"], ex.latest_release_tag), stats["bytes_read"]
+
+
+def stream_releases(client: httpx.Client, url: str) -> tuple:
+    ex = ReleaseListExtractor(limit=10)
+    stats = stream_extract(client, url, ex)
+    return (ex.releases, ex.first_datetime), stats["bytes_read"]
+
+
+def measure(fn, client: httpx.Client, urls: list[str]) -> dict:
+    latencies, total_bytes, peaks, results = [], 0, [], []
+    for url in urls:
+        tracemalloc.start()
+        start = time.perf_counter()
+        result, nbytes = fn(client, url)
+        latencies.append((time.perf_counter() - start) * 1000)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        total_bytes += nbytes
+        results.append(result)
+    return {
+        "results": results,
+        "bytes": total_bytes / len(urls),
+        "median_ms": median(latencies),
+        "peak_kib": median(peaks) / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=50)
+    args = parser.parse_args()
+
+    server = serve(args.pages)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    repo_urls = [f"{base}/acme/widget{i}" for i in range(args.pages)]
+    release_urls = [u + "/releases" for u in repo_urls]
+
+    with httpx.Client(timeout=30.0) as client:
+        for label, full_fn, stream_fn, urls in (
+            ("snapshot", full_snapshot, stream_snapshot, repo_urls),
+            ("releases", full_releases, stream_releases, release_urls),
+        ):
+            full = measure(full_fn, client, urls)
+            streamed = measure(stream_fn, client, urls)
+            assert full["results"] == streamed["results"], f"{label}: streaming output differs from full parse"
+            print(
+                f"{label:<9} full:   {full['bytes'] / 1024:8.1f} KiB/req  {full['median_ms']:7.2f} ms  peak {full['peak_kib']:8.1f} KiB\n"
+                f"{'':<9} stream: {streamed['bytes'] / 1024:8.1f} KiB/req  {streamed['median_ms']:7.2f} ms  peak {streamed['peak_kib']:8.1f} KiB"
+            )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from workers.src.analysis.comparison import MODE_WEIGHTS, rank_results, resolve_weights, score_repo
+from workers.src.common.store import JsonlStore
+
+WeightsKey = Tuple[Tuple[str, float], ...]
+
+
+class ComparisonService:
+    """Answers ad-hoc comparisons over arbitrary repo subsets from cached per-repo scores.
+
+    Analyses are kept once per release (latest row per ``dedupe_key`` wins), since every worker
+    run re-analyzes the same recent releases. Scores are cached per (repo, mode) for the mode's
+    default weights and dropped when new analyses arrive for that repo; weight overrides are
+    only covered by the response LRU. Whole responses are kept in an LRU keyed by (mode, repo
+    set, weights) and stamped with each repo's analysis version, so a stale entry is never
+    served after an invalidation.
+    """
+
+    def __init__(self, lru_size: int = 256) -> None:
+        self.lru_size = lru_size
+        self._analyses: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+        self._versions: Dict[str, int] = {}
+        self._scores: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._lru: "OrderedDict[tuple, Tuple[tuple, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._store: Optional[JsonlStore] = None
+        self._store_offset = 0
+        self.stats = {"lru_hits": 0, "score_hits": 0, "score_misses": 0, "bad_rows": 0}
+
+    @classmethod
+    def from_store(cls, store: JsonlStore, lru_size: int = 256) -> "ComparisonService":
+        service = cls(lru_size=lru_size)
+        service._store = store
+        service.refresh()
+        return service
+
+    def add_analyses(self, rows: Iterable[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._add_locked(rows)
+
+    def refresh(self) -> int:
+        """Pick up rows appended to change_analyses.jsonl since the last refresh."""
+        if self._store is None:
+            return 0
+        path = self._store.path("change_analyses")
+        if not path.exists():
+            return 0
+        with self._lock:
+            size = path.stat().st_size
+            if size < self._store_offset:
+                # File was rewound (e.g. a resumed run dropped uncheckpointed rows): reload from scratch.
+                self._analyses.clear()
+                self._scores.clear()
+                for repo_url in self._versions:
+                    self._versions[repo_url] += 1
+                self._store_offset = 0
+            elif size == self._store_offset:
+                return 0
+            rows = []
+            offset = self._store_offset
+            with path.open("rb") as f:
+                f.seek(offset)
+                for line in f:
+                    # A partially written last line is picked up on the next refresh.
+                    if not line.endswith(b"\n"):
+                        break
+                    offset += len(line)
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        rows.append(json.loads(line))
+                    except ValueError:
+                        # Skip a corrupt line rather than failing every request on it.
+                        self.stats["bad_rows"] += 1
+            self._add_locked(rows)
+            self._store_offset = offset
+            return len(rows)
+
+    def compare(
+        self,
+        repo_urls: List[str],
+        mode: str = "executive",
+        weights: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, Any]:
+        # Sorted so every ordering of the same set shares one LRU entry and gets the same response.
+        repos = sorted(set(repo_urls))
+        if not repos:
+            raise ValueError("comparison requires at least one repository")
+        if mode not in MODE_WEIGHTS:
+            raise ValueError(f"Unknown comparison mode: {mode!r}")
+        resolved = resolve_weights(mode, weights)
+        weights_key: WeightsKey = tuple(sorted(resolved.items()))
+        lru_key = (mode, tuple(repos), weights_key)
+        # Per-repo scores are only cached for the mode defaults, which bounds them by repos x modes.
+        cache_scores = resolved == resolve_weights(mode)
+
+        with self._lock:
+            versions = tuple(self._versions.get(r, 0) for r in repos)
+            cached = self._lru.get(lru_key)
+            if cached and cached[0] == versions:
+                self._lru.move_to_end(lru_key)
+                self.stats["lru_hits"] += 1
+                return cached[1]
+
+            result_rows = []
+            for repo_url in repos:
+                scored = self._scores.get(repo_url, {}).get(mode) if cache_scores else None
+                if scored is None:
+                    self.stats["score_misses"] += 1
+                    analyses = self._analyses.get(repo_url)
+                    scored = score_repo(list(analyses.values()) if analyses else [], mode=mode, weights=resolved)
+                    # Unknown repos are not cached, so arbitrary request URLs don't grow the service.
+                    if cache_scores and analyses:
+                        self._scores.setdefault(repo_url, {})[mode] = scored
+                else:
+                    self.stats["score_hits"] += 1
+                result_rows.append({"repo_url": repo_url, **scored})
+
+            result = {
+                "mode": mode,
+                "criteriaWeights": resolved,
+                "repositories": repos,
+                "results": rank_results(result_rows),
+            }
+            self._lru[lru_key] = (versions, result)
+            if len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+            return result
+
+    def _add_locked(self, rows: Iterable[Dict[str, Any]]) -> None:
+        for row in rows:
+            repo_url = row["repo_url"]
+            analyses = self._analyses[repo_url]
+            # Rows from before dedupe keys existed can't be matched to a release; keep each one.
+            key = row.get("dedupe_key") or f"row:{len(analyses)}"
+            analyses[key] = row
+            self._versions[repo_url] = self._versions.get(repo_url, 0) + 1
+            self._scores.pop(repo_url, None)
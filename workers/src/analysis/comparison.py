@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from collections import defaultdict
 from statistics import mean
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 
 IMPACT_SCORE = {"low": 1, "medium": 2, "high": 3}
@@ -14,6 +14,8 @@ MODE_WEIGHTS = {
     "usecase": {"impact": 0.5, "confidence": 0.3, "feature_bias": 0.2},
 }
 
+WEIGHT_KEYS = {"impact", "confidence", "feature_bias", "security_bias"}
+
 
 def _clamp(v: float, lo: float = 0.0, hi: float = 1.0) -> float:
     return max(lo, min(hi, v))
@@ -25,11 +27,24 @@ def _calibrate_confidence(sample_size: int, avg_conf: float) -> float:
     return round(_clamp(avg_conf * (0.6 + 0.4 * sample_factor)), 3)
 
 
-def score_repo(analyses: List[Dict[str, Any]], mode: str = "executive") -> Dict[str, Any]:
+def resolve_weights(mode: str, weights: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    if weights is None:
+        return MODE_WEIGHTS.get(mode, MODE_WEIGHTS["executive"])
+    unknown = set(weights) - WEIGHT_KEYS
+    if unknown:
+        raise ValueError(f"Unknown weight key(s): {sorted(unknown)}")
+    return {k: float(v) for k, v in weights.items()}
+
+
+def score_repo(
+    analyses: List[Dict[str, Any]],
+    mode: str = "executive",
+    weights: Optional[Dict[str, float]] = None,
+) -> Dict[str, Any]:
     if not analyses:
         return {"score": 0.0, "confidence": 0.0, "sample_size": 0}
 
-    weights = MODE_WEIGHTS.get(mode, MODE_WEIGHTS["executive"])
+    weights = resolve_weights(mode, weights)
 
     impacts = [IMPACT_SCORE.get(a.get("impact_level", "low"), 1) for a in analyses]
     avg_conf = mean([float(a.get("confidence", 0.0)) for a in analyses])
@@ -55,6 +70,13 @@ def score_repo(analyses: List[Dict[str, Any]], mode: str = "executive") -> Dict[
     }
 
 
+def rank_results(result_rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    result_rows.sort(key=lambda x: x["score"], reverse=True)
+    for i, row in enumerate(result_rows, start=1):
+        row["rank"] = i
+    return result_rows
+
+
 def build_comparison_run(mode: str, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
     by_repo: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
     for r in rows:
@@ -65,9 +87,7 @@ def build_comparison_run(mode: str, rows: List[Dict[str, Any]]) -> Dict[str, Any
         scored = score_repo(analyses, mode=mode)
         result_rows.append({"repo_url": repo_url, **scored})
 
-    result_rows.sort(key=lambda x: x["score"], reverse=True)
-    for i, row in enumerate(result_rows, start=1):
-        row["rank"] = i
+    rank_results(result_rows)
 
     return {
         "mode": mode,
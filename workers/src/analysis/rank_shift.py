@@ -25,3 +25,24 @@ def detect_rank_shifts(previous_results: List[Dict[str, Any]], current_results:
             )
 
     return shifts
+
+
+def detect_rank_shifts_from_record(rows: List[Dict[str, Any]], min_shift: int = 1) -> List[Dict[str, Any]]:
+    """Rank shifts straight from stored keyframe/delta rows (see `run_delta`), no history replay."""
+    shifts: List[Dict[str, Any]] = []
+    for row in rows:
+        before = row.get("previous_rank")
+        now = int(row.get("rank", 0))
+        if before is None or now == 0:
+            continue
+        delta = int(before) - now
+        if abs(delta) >= min_shift:
+            shifts.append(
+                {
+                    "repo_url": row["repo_url"],
+                    "previous_rank": int(before),
+                    "current_rank": now,
+                    "delta": delta,
+                }
+            )
+    return shifts
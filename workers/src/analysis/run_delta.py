@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Comparison runs are stored as periodic keyframes (every row) plus per-run deltas
+# (only rows that changed since the previous run of the same mode). Stored rows carry
+# `previous_rank` so rank shifts can be read straight off a record without replaying history.
+
+KEYFRAME_INTERVAL = 30
+
+
+def _strip(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in row.items() if k != "previous_rank"}
+
+
+def diff_results(
+    previous_rows: List[Dict[str, Any]],
+    current_rows: List[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    prev = {r["repo_url"]: _strip(r) for r in previous_rows}
+    current_urls = set()
+    changed: List[Dict[str, Any]] = []
+    for row in current_rows:
+        current_urls.add(row["repo_url"])
+        before = prev.get(row["repo_url"])
+        if before == row:
+            continue
+        entry = dict(row)
+        if before is not None:
+            entry["previous_rank"] = before.get("rank")
+        changed.append(entry)
+    removed = [url for url in prev if url not in current_urls]
+    return changed, removed
+
+
+def apply_delta(
+    rows: List[Dict[str, Any]],
+    changed: Iterable[Dict[str, Any]],
+    removed: Iterable[str],
+) -> List[Dict[str, Any]]:
+    by_url = {r["repo_url"]: r for r in rows}
+    for url in removed:
+        by_url.pop(url, None)
+    for row in changed:
+        by_url[row["repo_url"]] = _strip(row)
+    return sorted(by_url.values(), key=lambda r: r.get("rank", 0))
+
+
+def encode_comparison_run(
+    comparison: Dict[str, Any],
+    previous: Optional[Dict[str, Any]],
+    keyframe_interval: int = KEYFRAME_INTERVAL,
+) -> Dict[str, Any]:
+    """Build the stored record for `comparison` given the previous run state of the same mode.
+
+    `previous` is a run state as returned by `replay_runs` (full `results`, `criteriaWeights`,
+    `runsSinceKeyframe`). A keyframe is written when there is no previous state, the weights
+    changed, the keyframe interval is reached, or the delta would not be smaller than a keyframe.
+    """
+    results = comparison["results"]
+    previous_rows = previous["results"] if previous else []
+    changed, removed = diff_results(previous_rows, results)
+
+    is_keyframe = (
+        previous is None
+        or previous.get("criteriaWeights") != comparison["criteriaWeights"]
+        or previous.get("runsSinceKeyframe", 0) + 1 >= keyframe_interval
+        or len(changed) * 2 > len(results)
+    )
+
+    if is_keyframe:
+        prev_rank = {r["repo_url"]: r.get("rank") for r in previous_rows}
+        rows = []
+        for row in results:
+            if row["repo_url"] in prev_rank:
+                row = {**row, "previous_rank": prev_rank[row["repo_url"]]}
+            rows.append(row)
+        return {**comparison, "kind": "keyframe", "results": rows, "removed": []}
+
+    return {
+        "mode": comparison["mode"],
+        "kind": "delta",
+        "criteriaWeights": comparison["criteriaWeights"],
+        "results": changed,
+        "removed": removed,
+    }
+
+
+def next_run_state(previous: Optional[Dict[str, Any]], record: Dict[str, Any]) -> Dict[str, Any]:
+    # Records written before delta storage have no `kind` and hold full results.
+    if record.get("kind", "keyframe") == "keyframe" or previous is None:
+        rows = [_strip(r) for r in record.get("results", [])]
+        runs_since_keyframe = 0
+    else:
+        rows = apply_delta(previous["results"], record.get("results", []), record.get("removed", []))
+        runs_since_keyframe = previous.get("runsSinceKeyframe", 0) + 1
+
+    return {
+        "mode": record.get("mode"),
+        "criteriaWeights": record.get("criteriaWeights"),
+        "repositories": [r["repo_url"] for r in rows],
+        "results": rows,
+        "runsSinceKeyframe": runs_since_keyframe,
+    }
+
+
+def replay_runs(records: Iterable[Dict[str, Any]]) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Yield `(record, full run state)` for each stored record, in order."""
+    state: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        mode = record.get("mode")
+        state[mode] = next_run_state(state.get(mode), record)
+        yield record, state[mode]
+
+
+def latest_run_states(records: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    latest: Dict[str, Dict[str, Any]] = {}
+    for record, state in replay_runs(records):
+        latest[record.get("mode")] = state
+    return latest
+
+
+def reconstruct_run(records: List[Dict[str, Any]], mode: str, index: int) -> Optional[Dict[str, Any]]:
+    """Rebuild the `index`-th run (0-based) of `mode`, replaying only from its keyframe."""
+    positions = [i for i, r in enumerate(records) if r.get("mode") == mode]
+    if index >= len(positions):
+        return None
+    start = index
+    while start > 0 and records[positions[start]].get("kind", "keyframe") != "keyframe":
+        start -= 1
+
+    state = None
+    for pos in positions[start: index + 1]:
+        state = next_run_state(state, records[pos])
+    return state
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from workers.src.common.store import JsonlStore
+
+# Artifact streams whose byte offsets are recorded at each durable checkpoint.
+ARTIFACT_STREAMS = (
+    "repository_snapshots",
+    "release_events",
+    "normalized_events",
+    "change_analyses",
+    "comparison_runs",
+)
+# Fields kept when a finished run's log is compacted; payloads (snapshots, analyses, records) are dropped.
+SUMMARY_FIELDS = ("run_id", "stage", "repo_url", "mode", "repo_urls")
+# Finished run logs kept under runs/; older ones are deleted when a run finishes.
+KEEP_FINISHED_RUNS = 20
+
+
+class RunCheckpoint:
+    """Durable per-run checkpoint log (one fsynced JSONL record per finished stage).
+
+    Stages per repo are ``fetched`` -> ``analyzed`` -> ``persisted``; the comparison step
+    records ``encoded`` (the stored records, before any write) then ``compared`` per mode, and the
+    run ends with ``completed`` (or ``abandoned``). ``persisted`` and
+    ``compared`` records carry the artifact stream sizes at that point, so a resumed run can
+    truncate rows written after the last checkpoint and never write them twice.
+
+    Once a run is finished its log is compacted to the stage markers and logs beyond the newest
+    ``KEEP_FINISHED_RUNS`` are deleted, so ``runs/`` stays small.
+    """
+
+    def __init__(self, store: JsonlStore, run_id: str) -> None:
+        self.store = store
+        self.run_id = run_id
+        self.path = store.base_path / "runs" / f"{run_id}.jsonl"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.records: List[Dict[str, Any]] = []
+        if self.path.exists():
+            self.records = _read_complete_lines(self.path)
+
+    @classmethod
+    def start(cls, store: JsonlStore, repo_urls: List[str]) -> "RunCheckpoint":
+        run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        checkpoint = cls(store, run_id)
+        checkpoint.write("started", repo_urls=repo_urls, offsets=checkpoint._offsets())
+        return checkpoint
+
+    @classmethod
+    def latest_incomplete(cls, store: JsonlStore) -> Optional["RunCheckpoint"]:
+        runs_dir = store.base_path / "runs"
+        if not runs_dir.exists():
+            return None
+        # Run ids sort by start time and each start finishes the previous run, so only the newest can be open.
+        newest = max(runs_dir.glob("*.jsonl"), default=None)
+        if newest is None:
+            return None
+        checkpoint = cls(store, newest.stem)
+        if checkpoint.records and not checkpoint.completed:
+            return checkpoint
+        return None
+
+    @property
+    def repo_urls(self) -> List[str]:
+        return self.records[0]["repo_urls"] if self.records else []
+
+    @property
+    def completed(self) -> bool:
+        return any(r["stage"] in ("completed", "abandoned") for r in self.records)
+
+    def repo_stage(self, repo_url: str, stage: str) -> Optional[Dict[str, Any]]:
+        for record in reversed(self.records):
+            if record.get("repo_url") == repo_url and record["stage"] == stage:
+                return record
+        return None
+
+    def mode_stage(self, mode: str, stage: str) -> Optional[Dict[str, Any]]:
+        for record in reversed(self.records):
+            if record.get("mode") == mode and record["stage"] == stage:
+                return record
+        return None
+
+    def compared_modes(self) -> set[str]:
+        return {r["mode"] for r in self.records if r["stage"] == "compared"}
+
+    def rewind_artifacts(self) -> Dict[str, int]:
+        """Truncate artifact streams back to the last durable checkpoint; returns bytes dropped."""
+        offsets: Dict[str, int] = {}
+        for record in self.records:
+            offsets.update(record.get("offsets", {}))
+        dropped = {}
+        for name, size in offsets.items():
+            path = self.store.path(name)
+            if path.exists() and path.stat().st_size > size:
+                dropped[name] = path.stat().st_size - size
+                with path.open("r+b") as f:
+                    f.truncate(size)
+                    os.fsync(f.fileno())
+        return dropped
+
+    def write(self, stage: str, durable_artifacts: bool = False, **fields: Any) -> None:
+        if durable_artifacts:
+            self.store.flush()
+            fields["offsets"] = self._offsets()
+        record = {"run_id": self.run_id, "stage": stage, **fields}
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.records.append(record)
+        if stage in ("completed", "abandoned"):
+            self._compact()
+            _prune_finished(self.path.parent, KEEP_FINISHED_RUNS)
+
+    def _compact(self) -> None:
+        """Rewrite the finished log with stage markers only, atomically."""
+        self.records = [{k: r[k] for k in SUMMARY_FIELDS if k in r} for r in self.records]
+        tmp = self.path.with_suffix(".jsonl.tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            for record in self.records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        _fsync_dir(self.path.parent)
+
+    def _offsets(self) -> Dict[str, int]:
+        return {
+            name: self.store.path(name).stat().st_size if self.store.path(name).exists() else 0
+            for name in ARTIFACT_STREAMS
+        }
+
+
+def _prune_finished(runs_dir: Path, keep: int) -> None:
+    # Called right after a run finishes, so every log but the newest is finished too.
+    for path in sorted(runs_dir.glob("*.jsonl"), reverse=True)[keep:]:
+        path.unlink(missing_ok=True)
+
+
+def _fsync_dir(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _read_complete_lines(path: Path) -> List[Dict[str, Any]]:
+    records = []
+    valid = 0
+    with path.open("rb") as f:
+        for line in f:
+            # A torn final line (crash mid-write) never counted as a checkpoint.
+            if not line.endswith(b"\n"):
+                break
+            valid += len(line)
+            if line.strip():
+                records.append(json.loads(line))
+    if path.stat().st_size > valid:
+        with path.open("r+b") as f:
+            f.truncate(valid)
+    return records
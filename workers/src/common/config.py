@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from functools import cached_property
-from typing import List
+from typing import List, Literal
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -17,6 +17,14 @@ class Settings(BaseSettings):
     database_url: str = Field(alias="DATABASE_URL", default="")
     log_level: str = Field(alias="LOG_LEVEL", default="info")
     openai_model: str = Field(alias="OPENAI_MODEL", default="gpt-4.1-mini")
+    ingest_backend: Literal["scrapling", "graphql"] = Field(alias="INGEST_BACKEND", default="scrapling")
+    github_token: str = Field(alias="GITHUB_TOKEN", default="")
+    github_graphql_url: str = Field(alias="GITHUB_GRAPHQL_URL", default="https://api.github.com/graphql")
+    graphql_batch_size: int = Field(alias="GRAPHQL_BATCH_SIZE", default=50)
+    ingest_streaming: bool = Field(alias="INGEST_STREAMING", default=False)
+    jsonl_buffered: bool = Field(alias="JSONL_BUFFERED", default=True)
+    jsonl_fsync: str = Field(alias="JSONL_FSYNC", default="batch")
+    jsonl_background_writer: bool = Field(alias="JSONL_BACKGROUND_WRITER", default=False)
 
     @field_validator("monitored_repos")
     @classmethod
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 from contextlib import contextmanager
-from typing import Any, Dict, Iterable
+from typing import Any, Dict, Iterable, Optional
 
 import psycopg
 
@@ -103,8 +103,9 @@ def insert_change_analyses(
             cur.execute(
                 """
                 insert into change_analyses
-                (repository_id, change_type, summary, impact_level, confidence, rationale, model)
-                values (%s, %s, %s, %s, %s, %s, %s)
+                (repository_id, change_type, summary, impact_level, confidence, rationale, model, dedupe_key)
+                values (%s, %s, %s, %s, %s, %s, %s, %s)
+                on conflict (dedupe_key) do nothing
                 """,
                 (
                     repository_id,
@@ -114,6 +115,7 @@ def insert_change_analyses(
                     float(a.get("confidence", 0.4)),
                     a.get("rationale", "Generated analysis"),
                     a.get("model", "unknown"),
+                    a.get("dedupe_key"),
                 ),
             )
             inserted += cur.rowcount
@@ -126,12 +128,70 @@ def insert_comparison_run(
     criteria_weights: Dict[str, Any],
     repositories: list[str],
     results: list[Dict[str, Any]],
-) -> None:
+    kind: str = "keyframe",
+    keyframe_id: Optional[str] = None,
+    removed: Optional[list[str]] = None,
+    full_results: Optional[list[Dict[str, Any]]] = None,
+    runs_since_keyframe: int = 0,
+    dedupe_key: Optional[str] = None,
+) -> str:
+    """Insert a keyframe or delta run and refresh the per-mode summary row.
+
+    For deltas, `results`/`removed` hold only the changes, `keyframe_id` points at the governing
+    keyframe and `full_results` is the reconstructed state written to latest_comparison_runs.
+    A repeated `dedupe_key` is a no-op that returns the already stored run id.
+    """
+    full_results = results if full_results is None else full_results
     with conn.cursor() as cur:
         cur.execute(
             """
-            insert into comparison_runs (mode, criteria_weights, repositories, results)
-            values (%s, %s::jsonb, %s::jsonb, %s::jsonb)
+            insert into comparison_runs (mode, criteria_weights, repositories, results, kind, keyframe_id, removed, dedupe_key)
+            values (%s, %s::jsonb, %s::jsonb, %s::jsonb, %s, %s, %s::jsonb, %s)
+            on conflict (dedupe_key) do nothing
+            returning id::text, created_at
+            """,
+            (
+                mode,
+                _to_json(criteria_weights),
+                _to_json(repositories if kind == "keyframe" else []),
+                _to_json(results),
+                kind,
+                keyframe_id if kind == "delta" else None,
+                _to_json(removed or []),
+                dedupe_key,
+            ),
+        )
+        inserted = cur.fetchone()
+        if inserted is None:
+            cur.execute("select id::text from comparison_runs where dedupe_key = %s", (dedupe_key,))
+            return cur.fetchone()[0]
+        run_id, created_at = inserted
+        # Keep the per-mode summary row in the same transaction as the run itself.
+        cur.execute(
+            """
+            insert into latest_comparison_runs
+            (mode, comparison_run_id, criteria_weights, repositories, results, created_at, keyframe_id, runs_since_keyframe)
+            values (%s, %s, %s::jsonb, %s::jsonb, %s::jsonb, %s, %s, %s)
+            on conflict (mode)
+            do update set
+              comparison_run_id = excluded.comparison_run_id,
+              criteria_weights = excluded.criteria_weights,
+              repositories = excluded.repositories,
+              results = excluded.results,
+              created_at = excluded.created_at,
+              keyframe_id = excluded.keyframe_id,
+              runs_since_keyframe = excluded.runs_since_keyframe
+            where excluded.created_at >= latest_comparison_runs.created_at
             """,
-            (mode, _to_json(criteria_weights), _to_json(repositories), _to_json(results)),
+            (
+                mode,
+                run_id,
+                _to_json(criteria_weights),
+                _to_json(repositories),
+                _to_json(full_results),
+                created_at,
+                run_id if kind == "keyframe" else keyframe_id,
+                0 if kind == "keyframe" else runs_since_keyframe,
+            ),
         )
+        return run_id
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from types import FrameType
+from typing import Dict, Iterator, List, Optional, Tuple
+
+PROFILE_FORMATS = ("collapsed", "speedscope")
+
+Frame = Tuple[str, str, int]
+
+
+def _frame_key(frame: FrameType) -> Frame:
+    code = frame.f_code
+    return code.co_name, code.co_filename, code.co_firstlineno
+
+
+class StackSampler:
+    """Low-overhead wall-clock sampler for a single thread.
+
+    A daemon thread reads the target thread's current frame every ``interval`` seconds and
+    counts the stack under the active stage label. Nothing is hooked into the profiled code.
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None) -> None:
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stage = "other"
+        self.samples: Dict[str, Counter] = defaultdict(Counter)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack: List[Frame] = []
+            while frame is not None:
+                stack.append(_frame_key(frame))
+                frame = frame.f_back
+            stack.reverse()
+            self.samples[self.stage][tuple(stack)] += 1
+
+    def write_collapsed(self, out_dir: Path) -> List[Path]:
+        paths = []
+        for stage, stacks in self.samples.items():
+            path = out_dir / f"cpu-{stage}.collapsed"
+            with path.open("w", encoding="utf-8") as f:
+                for stack, count in stacks.most_common():
+                    names = ";".join(f"{name} ({Path(filename).name}:{line})" for name, filename, line in stack)
+                    f.write(f"{names} {count}\n")
+            paths.append(path)
+        return paths
+
+    def write_speedscope(self, out_dir: Path) -> List[Path]:
+        frames: List[Frame] = []
+        index: Dict[Frame, int] = {}
+        profiles = []
+        weight = round(self.interval * 1000, 3)
+
+        for stage, stacks in self.samples.items():
+            samples = []
+            weights = []
+            for stack, count in stacks.items():
+                ids = []
+                for key in stack:
+                    if key not in index:
+                        index[key] = len(frames)
+                        frames.append(key)
+                    ids.append(index[key])
+                samples.append(ids)
+                weights.append(weight * count)
+            profiles.append(
+                {
+                    "type": "sampled",
+                    "name": stage,
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": round(sum(weights), 3),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            )
+
+        path = out_dir / "cpu.speedscope.json"
+        payload = {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": [{"name": n, "file": f, "line": line} for n, f, line in frames]},
+            "profiles": profiles,
+            "name": "clawstrack worker run",
+            "exporter": "workers.src.common.profiling",
+        }
+        path.write_text(json.dumps(payload), encoding="utf-8")
+        return [path]
+
+
+class MemoryTracker:
+    """tracemalloc snapshots at stage entry and exit; each stage is diffed against its own entry.
+
+    Growth is accumulated per stage and per allocation site, so a stage that runs once per
+    repository reports its total contribution across the run. Allocations between stages are
+    charged to ``other``; a nested stage's growth also counts toward the enclosing stage.
+    """
+
+    def __init__(self, frames: int = 10, top: int = 25) -> None:
+        self.frames = frames
+        self.top = top
+        self.growth: Dict[str, Counter] = defaultdict(Counter)
+        self.peak = 0
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._baselines: List[tracemalloc.Snapshot] = []
+
+    def start(self) -> None:
+        tracemalloc.start(self.frames)
+        self._previous = self._snapshot()
+
+    def stop(self) -> None:
+        self.peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    def enter(self) -> None:
+        current = self._snapshot()
+        if not self._baselines and self._previous is not None:
+            self._record("other", current, self._previous)
+        self._baselines.append(current)
+
+    def exit(self, stage: str) -> None:
+        current = self._snapshot()
+        self._record(stage, current, self._baselines.pop())
+        self._previous = current
+
+    def _record(self, stage: str, current: tracemalloc.Snapshot, baseline: tracemalloc.Snapshot) -> None:
+        for stat in current.compare_to(baseline, "traceback"):
+            if stat.size_diff:
+                self.growth[stage][tuple(str(fr) for fr in stat.traceback)] += stat.size_diff
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+                tracemalloc.Filter(False, __file__),
+            )
+        )
+
+    def write_report(self, out_dir: Path) -> List[Path]:
+        path = out_dir / "memory.txt"
+        with path.open("w", encoding="utf-8") as f:
+            f.write(f"peak_traced_bytes={self.peak}\n")
+            for stage, sites in self.growth.items():
+                f.write(f"\n== stage={stage} net_bytes={sum(sites.values())}\n")
+                for site, size in sites.most_common(self.top):
+                    f.write(f"{size:+12d} B\n")
+                    for line in reversed(site):
+                        f.write(f"    {line}\n")
+        return [path]
+
+
+class RunProfiler:
+    """Per-run profiling hooks for the worker pipeline (no-op unless enabled)."""
+
+    def __init__(
+        self,
+        out_dir: Path,
+        cpu: bool = False,
+        cpu_format: str = "speedscope",
+        cpu_interval: float = 0.005,
+        memory: bool = False,
+    ) -> None:
+        if cpu_format not in PROFILE_FORMATS:
+            raise ValueError(f"Invalid profile format: {cpu_format} (expected one of {PROFILE_FORMATS})")
+        self.enabled = cpu or memory
+        self.out_dir = out_dir / datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        self.cpu_format = cpu_format
+        self.sampler = StackSampler(interval=cpu_interval) if cpu else None
+        self.memory = MemoryTracker() if memory else None
+
+    def start(self) -> None:
+        if self.memory:
+            self.memory.start()
+        if self.sampler:
+            self.sampler.start()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        previous = self.sampler.stage if self.sampler else None
+        if self.sampler:
+            self.sampler.stage = name
+        if self.memory:
+            self.memory.enter()
+        try:
+            yield
+        finally:
+            if self.sampler:
+                self.sampler.stage = previous
+            if self.memory:
+                self.memory.exit(name)
+
+    def finish(self) -> List[Path]:
+        if not self.enabled:
+            return []
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        paths: List[Path] = []
+        if self.sampler:
+            self.sampler.stop()
+            if self.cpu_format == "collapsed":
+                paths += self.sampler.write_collapsed(self.out_dir)
+            else:
+                paths += self.sampler.write_speedscope(self.out_dir)
+        if self.memory:
+            self.memory.stop()
+            paths += self.memory.write_report(self.out_dir)
+        return paths
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import psycopg
+from psycopg.rows import dict_row
+
+from workers.src.analysis.rank_shift import detect_rank_shifts_from_record
+from workers.src.analysis.run_delta import next_run_state
+
+# Read path for run history. Every query here is backed by an index or the
+# latest_comparison_runs summary table (see docs/migrations/0001_run_history_read_path.sql).
+
+
+# ORDER BY must name table.id: a bare `id` resolves to the `id::text` output column and defeats the index.
+
+
+def _keyset_clause(column: str, before: Optional[datetime], before_id: Optional[str] = None) -> str:
+    # Only add the range predicate when paging so it stays an index condition, not a filter.
+    if before is None:
+        return "true"
+    if before_id is None:
+        return f"{column} < %s"
+    # Row comparison on (column, id) so rows sharing a timestamp are not skipped at a page boundary.
+    return f"({column}, id) < (%s, %s::uuid)"
+
+
+def _keyset_params(before: Optional[datetime], before_id: Optional[str] = None) -> tuple:
+    if before is None:
+        return ()
+    return (before,) if before_id is None else (before, before_id)
+
+
+def fetch_latest_comparison_run(conn: psycopg.Connection, mode: str) -> Optional[Dict[str, Any]]:
+    with conn.cursor(row_factory=dict_row) as cur:
+        cur.execute(
+            """
+            select comparison_run_id::text as id, mode, criteria_weights, repositories, results, created_at,
+                   keyframe_id::text as keyframe_id, runs_since_keyframe
+            from latest_comparison_runs
+            where mode = %s
+            """,
+            (mode,),
+        )
+        row = cur.fetchone()
+        if row:
+            return row
+
+        # Summary row missing (e.g. table not backfilled yet): fall back to ix_comparison_runs_mode_created.
+        cur.execute(
+            "select id::text from comparison_runs where mode = %s order by created_at desc limit 1",
+            (mode,),
+        )
+        latest = cur.fetchone()
+    return reconstruct_comparison_run(conn, latest["id"]) if latest else None
+
+
+def fetch_latest_comparison_runs(conn: psycopg.Connection) -> Dict[str, Dict[str, Any]]:
+    with conn.cursor(row_factory=dict_row) as cur:
+        cur.execute(
+            """
+            select comparison_run_id::text as id, mode, criteria_weights, repositories, results, created_at,
+                   keyframe_id::text as keyframe_id, runs_since_keyframe
+            from latest_comparison_runs
+            """
+        )
+        runs = {row["mode"]: row for row in cur.fetchall()}
+
+        # Modes without a summary row (table not backfilled yet). Skip-scan the distinct modes, then take
+        # each missing mode's newest run, both on ix_comparison_runs_mode_created, so this stays a few
+        # index probes instead of a full pass over the run history.
+        cur.execute(
+            """
+            with recursive modes as (
+              (select mode from comparison_runs order by mode limit 1)
+              union all
+              select (select c.mode from comparison_runs c where c.mode > modes.mode order by c.mode limit 1)
+              from modes
+              where modes.mode is not null
+            )
+            select latest.id::text as id, modes.mode
+            from modes
+            cross join lateral (
+              select c.id from comparison_runs c where c.mode = modes.mode order by c.created_at desc limit 1
+            ) latest
+            where modes.mode is not null and modes.mode <> all(%s)
+            """,
+            (list(runs),),
+        )
+        missing = cur.fetchall()
+    for row in missing:
+        run = reconstruct_comparison_run(conn, row["id"])
+        if run:
+            runs[row["mode"]] = run
+    return runs
+
+
+def reconstruct_comparison_run(conn: psycopg.Connection, run_id: str) -> Optional[Dict[str, Any]]:
+    """Rebuild a run's full results from its keyframe plus the deltas up to it."""
+    with conn.cursor(row_factory=dict_row) as cur:
+        cur.execute(
+            """
+            select coalesce(keyframe_id, id)::text as keyframe_id, created_at
+            from comparison_runs
+            where id = %s
+            """,
+            (run_id,),
+        )
+        target = cur.fetchone()
+        if not target:
+            return None
+        # Keyframe row plus its deltas via ix_comparison_runs_keyframe_created.
+        cur.execute(
+            """
+            select id::text as id, mode, kind, criteria_weights as "criteriaWeights", results, removed, created_at
+            from comparison_runs
+            where id = %s
+            union all
+            select id::text as id, mode, kind, criteria_weights, results, removed, created_at
+            from comparison_runs
+            where keyframe_id = %s and created_at <= %s
+            order by created_at
+            """,
+            (target["keyframe_id"], target["keyframe_id"], target["created_at"]),
+        )
+        state = None
+        last = None
+        for last in cur.fetchall():
+            state = next_run_state(state, last)
+    if state is None:
+        return None
+    return {
+        "id": last["id"],
+        "mode": state["mode"],
+        "criteria_weights": state["criteriaWeights"],
+        "repositories": state["repositories"],
+        "results": state["results"],
+        "created_at": last["created_at"],
+        "keyframe_id": target["keyframe_id"],
+        "runs_since_keyframe": state["runsSinceKeyframe"],
+    }
+
+
+def fetch_rank_shift_history(
+    conn: psycopg.Connection,
+    mode: str,
+    since: datetime,
+    min_shift: int = 1,
+) -> List[Dict[str, Any]]:
+    """Rank shifts per run since `since`, read directly from stored keyframe/delta rows."""
+    with conn.cursor(row_factory=dict_row) as cur:
+        cur.execute(
+            """
+            select id::text as id, results, created_at
+            from comparison_runs
+            where mode = %s and created_at >= %s
+            order by created_at
+            """,
+            (mode, since),
+        )
+        return [
+            {
+                "id": row["id"],
+                "created_at": row["created_at"],
+                "shifts": detect_rank_shifts_from_record(row["results"], min_shift=min_shift),
+            }
+            for row in cur.fetchall()
+        ]
+
+
+def fetch_comparison_run_history(
+    conn: psycopg.Connection,
+    mode: str,
+    before: Optional[datetime] = None,
+    limit: int = 50,
+) -> List[Dict[str, Any]]:
+    # Stored records: delta rows hold only changed results; use reconstruct_comparison_run for full state.
+    with conn.cursor(row_factory=dict_row) as cur:
+        cur.execute(
+            """
+            select id::text as id, mode, kind, keyframe_id::text as keyframe_id, criteria_weights, repositories,
+                   results, removed, created_at
+            from comparison_runs
+            where mode = %s and {keyset}
+            order by created_at desc
+            limit %s
+            """.format(keyset=_keyset_clause("created_at", before)),
+            (mode, *_keyset_params(before), limit),
+        )
+        return cur.fetchall()
+
+
+def fetch_repository_id(conn: psycopg.Connection, repo_url: str) -> Optional[str]:
+    with conn.cursor() as cur:
+        cur.execute("select id::text from repositories where url = %s", (repo_url,))
+        row = cur.fetchone()
+        return row[0] if row else None
+
+
+def fetch_change_analysis_timeline(
+    conn: psycopg.Connection,
+    repository_id: str,
+    before: Optional[datetime] = None,
+    before_id: Optional[str] = None,
+    limit: int = 50,
+) -> List[Dict[str, Any]]:
+    # Keyset pagination on (created_at, id) via ix_change_analyses_repo_created_id: pass the last
+    # row's created_at and id as `before` / `before_id`. A repo's analyses share one transaction's now().
+    with conn.cursor(row_factory=dict_row) as cur:
+        cur.execute(
+            """
+            select id::text as id, change_type, summary, impact_level, confidence, rationale, model, created_at
+            from change_analyses
+            where repository_id = %s and {keyset}
+            order by created_at desc, change_analyses.id desc
+            limit %s
+            """.format(keyset=_keyset_clause("created_at", before, before_id)),
+            (repository_id, *_keyset_params(before, before_id), limit),
+        )
+        return cur.fetchall()
+
+
+def fetch_release_timeline(
+    conn: psycopg.Connection,
+    repository_id: str,
+    before: Optional[datetime] = None,
+    before_id: Optional[str] = None,
+    limit: int = 50,
+) -> List[Dict[str, Any]]:
+    """Releases newest first, undated ones last.
+
+    Keyset pagination on (published_at, id) via ix_release_events_repo_published_id: pass the last
+    row's published_at and id as `before` / `before_id`. A null `before` with a `before_id`
+    continues inside the undated tail.
+    """
+    columns = "id::text as id, version, published_at, title, notes_ref, source_url, is_security_relevant"
+    rows: List[Dict[str, Any]] = []
+    with conn.cursor(row_factory=dict_row) as cur:
+        if before is not None or before_id is None:
+            if before is None:
+                keyset, params = "published_at is not null", ()
+            elif before_id is None:
+                keyset, params = "published_at < %s", (before,)
+            else:
+                keyset, params = "(published_at, id) < (%s, %s::uuid)", (before, before_id)
+            cur.execute(
+                f"""
+                select {columns}
+                from release_events
+                where repository_id = %s and {keyset}
+                order by published_at desc nulls last, release_events.id desc
+                limit %s
+                """,
+                (repository_id, *params, limit),
+            )
+            rows = cur.fetchall()
+            if len(rows) >= limit:
+                return rows
+            before_id = None
+
+        # Undated tail, walked separately so a null cursor value never ends paging.
+        cur.execute(
+            f"""
+            select {columns}
+            from release_events
+            where repository_id = %s and published_at is null and {"id < %s::uuid" if before_id else "true"}
+            order by published_at desc nulls last, release_events.id desc
+            limit %s
+            """,
+            (repository_id, *((before_id,) if before_id else ()), limit - len(rows)),
+        )
+        rows.extend(cur.fetchall())
+    return rows
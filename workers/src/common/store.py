@@ -1,35 +1,135 @@
 from __future__ import annotations
 
+import atexit
 import json
+import os
+import queue
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import IO, Any, Dict, List, Optional
 
 from pydantic import BaseModel
 
+FSYNC_POLICIES = ("none", "batch", "close")
+
 
 class JsonlStore:
     """Simple persistence adapter (Phase 2.1).
 
     Keeps ingestion artifacts in local JSONL files so we can inspect runs before DB wiring.
+
+    With ``buffered=True`` rows are group-committed: one handle per stream stays open and rows
+    are written once ``flush_rows`` accumulate or ``flush_interval`` seconds pass. ``fsync``
+    controls durability (``none``, ``batch`` = fsync every group commit, ``close`` = only on close).
+    ``background=True`` moves serialization and writes onto a writer thread fed by a queue.
+    Buffered stores must be closed (or used as a context manager); an atexit hook covers
+    unexpected interpreter exits. A row the writer thread cannot write is skipped and its error
+    is raised from the next ``append_raw`` / ``flush`` / ``close``.
     """
 
-    def __init__(self, base_dir: str = "workers/.data") -> None:
+    def __init__(
+        self,
+        base_dir: str = "workers/.data",
+        buffered: bool = False,
+        flush_rows: int = 500,
+        flush_interval: float = 1.0,
+        fsync: str = "batch",
+        background: bool = False,
+    ) -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Invalid fsync policy: {fsync} (expected one of {FSYNC_POLICIES})")
+
         self.base_path = Path(base_dir)
         self.base_path.mkdir(parents=True, exist_ok=True)
 
-    def _path(self, name: str) -> Path:
+        self.buffered = buffered or background
+        self.flush_rows = max(1, flush_rows)
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.background = background
+
+        self._buffers: Dict[str, List[str]] = {}
+        self._handles: Dict[str, IO[str]] = {}
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._queue: Optional[queue.Queue] = None
+        self._writer: Optional[threading.Thread] = None
+        self._error: Optional[Exception] = None
+
+        if self.background:
+            self._queue = queue.Queue()
+            self._writer = threading.Thread(target=self._writer_loop, name="jsonl-writer", daemon=True)
+            self._writer.start()
+        if self.buffered:
+            atexit.register(self.close)
+
+    def __enter__(self) -> "JsonlStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def path(self, name: str) -> Path:
         return self.base_path / f"{name}.jsonl"
 
     def append_model(self, name: str, model: BaseModel) -> None:
         self.append_raw(name, model.model_dump(mode="json"))
 
     def append_raw(self, name: str, row: Dict[str, Any]) -> None:
-        path = self._path(name)
-        with path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        if not self.buffered:
+            path = self.path(name)
+            with path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            return
+
+        if self._closed:
+            raise RuntimeError("JsonlStore is closed")
+        self._raise_writer_error()
+        if self._queue is not None:
+            self._queue.put((name, row))
+            return
+
+        with self._lock:
+            self._buffer(name, json.dumps(row, ensure_ascii=False) + "\n")
+            self._maybe_flush()
+
+    def flush(self) -> None:
+        """Write all buffered rows to disk (and fsync them under the ``batch`` policy)."""
+        if not self.buffered:
+            return
+        if self._queue is not None and self._writer is not None and self._writer.is_alive():
+            done = threading.Event()
+            self._queue.put(("__flush__", done))
+            done.wait()
+        else:
+            self._drain_queue()
+            with self._lock:
+                self._flush_locked(sync=self.fsync == "batch")
+        self._raise_writer_error()
+
+    def close(self) -> None:
+        if not self.buffered or self._closed:
+            return
+        self._closed = True
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        # Rows still queued if the writer thread died are written here instead of being lost.
+        self._drain_queue()
+        with self._lock:
+            self._flush_locked(sync=self.fsync != "none")
+            for handle in self._handles.values():
+                handle.close()
+            self._handles.clear()
+        atexit.unregister(self.close)
+        self._raise_writer_error()
 
     def read_all(self, name: str) -> List[Dict[str, Any]]:
-        path = self._path(name)
+        self.flush()
+        path = self.path(name)
         if not path.exists():
             return []
         rows: List[Dict[str, Any]] = []
@@ -40,3 +140,79 @@ class JsonlStore:
                     continue
                 rows.append(json.loads(line))
         return rows
+
+    def _buffer(self, name: str, line: str) -> None:
+        self._buffers.setdefault(name, []).append(line)
+        self._pending += 1
+
+    def _maybe_flush(self) -> None:
+        if self._pending >= self.flush_rows or time.monotonic() - self._last_flush >= self.flush_interval:
+            self._flush_locked(sync=self.fsync == "batch")
+
+    def _flush_locked(self, sync: bool) -> None:
+        for name, lines in self._buffers.items():
+            if not lines:
+                continue
+            handle = self._handles.get(name)
+            if handle is None:
+                handle = self.path(name).open("a", encoding="utf-8")
+                self._handles[name] = handle
+            handle.write("".join(lines))
+            lines.clear()
+        for handle in self._handles.values():
+            handle.flush()
+            if sync:
+                os.fsync(handle.fileno())
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def _writer_loop(self) -> None:
+        assert self._queue is not None
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                with self._lock:
+                    if self._pending:
+                        self._guarded(self._flush_locked, self.fsync == "batch")
+                continue
+
+            if item is None:
+                return
+            self._write_item(*item)
+
+    def _drain_queue(self) -> None:
+        if self._queue is None:
+            return
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None:
+                self._write_item(*item)
+
+    def _write_item(self, name: str, payload: Any) -> None:
+        with self._lock:
+            if name == "__flush__":
+                self._guarded(self._flush_locked, self.fsync == "batch")
+                payload.set()
+                return
+            self._guarded(self._buffer_row, name, payload)
+
+    def _buffer_row(self, name: str, row: Dict[str, Any]) -> None:
+        self._buffer(name, json.dumps(row, ensure_ascii=False) + "\n")
+        self._maybe_flush()
+
+    def _guarded(self, fn: Any, *args: Any) -> None:
+        # Keep the writer thread alive; the first failure is re-raised on the caller's thread.
+        try:
+            fn(*args)
+        except Exception as exc:
+            if self._error is None:
+                self._error = exc
+
+    def _raise_writer_error(self) -> None:
+        error, self._error = self._error, None
+        if error is not None:
+            raise RuntimeError(f"JsonlStore background writer failed: {error!r}") from error
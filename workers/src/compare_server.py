@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+from workers.src.analysis.compare_service import ComparisonService
+from workers.src.common.store import JsonlStore
+
+
+def make_handler(service: ComparisonService) -> type:
+    class CompareHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; without this keep-alive clients hit delayed ACKs.
+        disable_nagle_algorithm = True
+
+        def do_POST(self) -> None:
+            if self.path != "/api/compare":
+                self._send(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                service.refresh()
+                result = service.compare(
+                    body.get("repositories", []),
+                    mode=body.get("mode", "executive"),
+                    weights=body.get("weights"),
+                )
+            except (ValueError, TypeError, AttributeError) as exc:
+                self._send(400, {"error": str(exc)})
+                return
+            self._send(200, result)
+
+        def do_GET(self) -> None:
+            if self.path == "/api/health":
+                self._send(200, {"ok": True, **service.stats})
+                return
+            self._send(404, {"error": "not found"})
+
+        def _send(self, status: int, payload: Dict[str, Any]) -> None:
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    return CompareHandler
+
+
+class CompareServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The stdlib default backlog of 5 resets connections under bursts of concurrent clients.
+    request_queue_size = 128
+
+
+def serve(service: ComparisonService, host: str = "127.0.0.1", port: int = 8787) -> CompareServer:
+    return CompareServer((host, port), make_handler(service))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local ad-hoc comparison endpoint (POST /api/compare).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--data-dir", default="workers/.data")
+    parser.add_argument("--lru-size", type=int, default=256)
+    args = parser.parse_args()
+
+    service = ComparisonService.from_store(JsonlStore(args.data_dir), lru_size=args.lru_size)
+    server = serve(service, args.host, args.port)
+    print(f"compare server listening on http://{args.host}:{args.port}/api/compare")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
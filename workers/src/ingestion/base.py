@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from typing import List, Protocol
+
+from workers.src.common.models import ReleaseEvent, RepositorySnapshot
+
+
+class Ingestor(Protocol):
+    """What the worker run needs from an ingestion backend (scraping or GraphQL)."""
+
+    def prefetch(self, repo_urls: List[str]) -> None:
+        """Announce the repos about to be fetched so a backend can batch lookups."""
+
+    def fetch_snapshot(self, repo_url: str) -> RepositorySnapshot: ...
+
+    def fetch_releases(self, repo_url: str) -> List[ReleaseEvent]: ...
+
+    def close(self) -> None: ...
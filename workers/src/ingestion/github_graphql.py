@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from workers.src.common.models import ReleaseEvent, RepositorySnapshot
+from workers.src.common.repo_parser import parse_owner_repo
+from workers.src.ingestion.selectors import parse_github_datetime
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+MAX_RELEASES = 10
+
+REPO_FIELDS = """
+    stargazerCount
+    forkCount
+    issues(states: OPEN) { totalCount }
+    defaultBranchRef { name }
+    releases(first: %d, orderBy: {field: CREATED_AT, direction: DESC}) {
+      nodes { tagName name publishedAt url }
+    }
+""" % MAX_RELEASES
+
+
+def build_batch_query(count: int) -> str:
+    """One aliased `repository` lookup per repo (r0..rN) plus the rate-limit cost of the query."""
+    params = ", ".join(f"$o{i}: String!, $n{i}: String!" for i in range(count))
+    repos = "\n".join(f"  r{i}: repository(owner: $o{i}, name: $n{i}) {{{REPO_FIELDS}  }}" for i in range(count))
+    return f"query({params}) {{\n{repos}\n  rateLimit {{ cost remaining resetAt }}\n}}"
+
+
+class GitHubGraphQLIngestor:
+    """GitHub GraphQL ingestion for snapshots + releases, batching many repos per request.
+
+    Same `fetch_snapshot` / `fetch_releases` contract as `GitHubScraplingIngestor`. Repos passed
+    to `prefetch` are looked up `batch_size` at a time using aliases, so a run costs roughly
+    one request per batch instead of two page loads per repo. Query cost is read back from
+    `rateLimit`; when the remaining budget is below the last batch's cost we wait for the reset.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        batch_size: int = 50,
+        url: str = GITHUB_GRAPHQL_URL,
+    ) -> None:
+        if not token:
+            raise ValueError("GITHUB_TOKEN is required for the GraphQL ingestion backend")
+        self.batch_size = max(1, batch_size)
+        self.url = url
+        self.client = httpx.Client(
+            timeout=60.0,
+            headers={"Authorization": f"Bearer {token}", "User-Agent": "clawstrack-workers"},
+        )
+        self.requests = 0
+        self.cost_spent = 0
+        self.rate_limit: Dict[str, Any] = {}
+        self._planned: List[str] = []
+        self._nodes: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    def prefetch(self, repo_urls: List[str]) -> None:
+        """Declare upcoming repos so lookups are batched (fetched lazily, one batch at a time)."""
+        self._planned = [u for u in dict.fromkeys(repo_urls) if u not in self._nodes]
+
+    def close(self) -> None:
+        self.client.close()
+
+    def fetch_snapshot(self, repo_url: str) -> RepositorySnapshot:
+        node = self._node(repo_url)
+        owner, name = parse_owner_repo(repo_url)
+        releases = ((node or {}).get("releases") or {}).get("nodes") or []
+        return RepositorySnapshot(
+            repo_url=repo_url,
+            captured_at=datetime.now(timezone.utc),
+            default_branch=((node or {}).get("defaultBranchRef") or {}).get("name"),
+            stars=(node or {}).get("stargazerCount"),
+            forks=(node or {}).get("forkCount"),
+            open_issues=((node or {}).get("issues") or {}).get("totalCount"),
+            latest_release_tag=releases[0]["tagName"] if releases else None,
+            raw_payload_ref=f"graphql:{owner}/{name}",
+        )
+
+    def fetch_releases(self, repo_url: str) -> List[ReleaseEvent]:
+        node = self._node(repo_url)
+        events: List[ReleaseEvent] = []
+        for rel in ((node or {}).get("releases") or {}).get("nodes") or []:
+            tag = rel["tagName"]
+            events.append(
+                ReleaseEvent(
+                    repo_url=repo_url,
+                    version=tag,
+                    published_at=parse_github_datetime(rel["publishedAt"]) if rel.get("publishedAt") else None,
+                    title=f"Release {tag}",
+                    notes_url=rel["url"],
+                    source_url=rel["url"],
+                    is_security_relevant=("security" in tag.lower()),
+                )
+            )
+        return events[:MAX_RELEASES]
+
+    def _node(self, repo_url: str) -> Optional[Dict[str, Any]]:
+        if repo_url not in self._nodes:
+            batch = [repo_url] + [u for u in self._planned if u != repo_url and u not in self._nodes]
+            self._fetch_batch(batch[: self.batch_size])
+        return self._nodes.get(repo_url)
+
+    def _fetch_batch(self, repo_urls: List[str]) -> None:
+        variables: Dict[str, str] = {}
+        for i, url in enumerate(repo_urls):
+            variables[f"o{i}"], variables[f"n{i}"] = parse_owner_repo(url)
+
+        self._wait_for_budget()
+        resp = self.client.post(self.url, json={"query": build_batch_query(len(repo_urls)), "variables": variables})
+        resp.raise_for_status()
+        payload = resp.json()
+        self.requests += 1
+
+        data = payload.get("data") or {}
+        if not data and payload.get("errors"):
+            raise RuntimeError(f"GitHub GraphQL query failed: {payload['errors'][:3]}")
+
+        # Missing/private repos come back as null aliases (with NOT_FOUND errors); keep them as empty.
+        for i, url in enumerate(repo_urls):
+            self._nodes[url] = data.get(f"r{i}")
+
+        self.rate_limit = data.get("rateLimit") or {}
+        self.cost_spent += int(self.rate_limit.get("cost", 0))
+
+    def _wait_for_budget(self) -> None:
+        remaining = self.rate_limit.get("remaining")
+        # The next batch is the same size as the last one (or smaller), so it costs about the same.
+        if remaining is None or remaining >= int(self.rate_limit.get("cost", 1)):
+            return
+        reset_at = parse_github_datetime(self.rate_limit.get("resetAt", ""))
+        if reset_at is None:
+            return
+        wait = (reset_at - datetime.now(timezone.utc)).total_seconds()
+        if wait > 0:
+            print(f"graphql rate limit low (remaining={remaining}); sleeping {wait:.0f}s until reset")
+            time.sleep(wait)
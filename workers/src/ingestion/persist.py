@@ -32,13 +32,21 @@ def persist_repo_batch(repo_url: str, snapshot: dict, releases: list[dict], anal
     }
 
 
-def persist_comparison_run(mode: str, run_payload: dict) -> None:
+def persist_comparison_run(mode: str, record: dict, state: dict, dedupe_key: str | None = None) -> str:
+    """Persist a stored run record (see analysis.run_delta) with its reconstructed full state."""
     with get_conn() as conn:
-        insert_comparison_run(
+        run_id = insert_comparison_run(
             conn,
             mode=mode,
-            criteria_weights=run_payload["criteriaWeights"],
-            repositories=run_payload["repositories"],
-            results=run_payload["results"],
+            criteria_weights=record["criteriaWeights"],
+            repositories=record.get("repositories", state["repositories"]),
+            results=record["results"],
+            kind=record["kind"],
+            keyframe_id=state.get("keyframeId"),
+            removed=record.get("removed", []),
+            full_results=state["results"],
+            runs_since_keyframe=state["runsSinceKeyframe"],
+            dedupe_key=dedupe_key,
         )
         conn.commit()
+    return run_id
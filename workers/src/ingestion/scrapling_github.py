@@ -1,53 +1,93 @@
 from __future__ import annotations
 
-import re
 from datetime import datetime, timezone
-from typing import List
+from typing import Any, Dict, List, Optional
 
+import httpx
 from scrapling import Fetcher
 
 from workers.src.common.models import ReleaseEvent, RepositorySnapshot
 from workers.src.common.repo_parser import parse_owner_repo
-
-RELEASE_CARD_RE = re.compile(
-    r'href="(?P<href>/(?P<owner>[A-Za-z0-9_.-]+)/(?P<repo>[A-Za-z0-9_.-]+)/releases/tag/(?P<tag>[^"]+))"',
-    re.IGNORECASE,
+from workers.src.ingestion.selectors import (
+    RELEASE_CARD_RE,
+    extract_default_branch,
+    extract_first_datetime,
+    extract_latest_release_tag,
+    extract_social_count,
+)
+from workers.src.ingestion.streaming import (
+    IncrementalExtractor,
+    ReleaseListExtractor,
+    SnapshotExtractor,
+    stream_extract,
 )
-ISO_TS_RE = re.compile(r"datetime=\"(?P<dt>[^\"]+)\"")
-META_COUNT_RE = re.compile(r"([0-9][0-9,]*)")
+
+MAX_RELEASES = 10
+
+# Browser-like headers for the streaming path, in line with what Scrapling's Fetcher sends,
+# so GitHub serves the same markup the selectors were written against.
+STREAM_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Referer": "https://www.google.com/",
+}
 
 
 class GitHubScraplingIngestor:
     """Scrapling-based GitHub ingestion for snapshots + releases.
 
     Note: GitHub markup can change. This parser intentionally keeps resilient fallbacks.
+
+    With ``streaming=True`` pages are read through httpx in chunks and the connection is closed
+    as soon as every field has been found; ``last_stream_stats`` records bytes read and latency.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, streaming: bool = False) -> None:
         self.fetcher = Fetcher()
+        self.streaming = streaming
+        self.client: Optional[httpx.Client] = None
+        self.last_stream_stats: Optional[Dict[str, Any]] = None
+        if streaming:
+            self.client = httpx.Client(timeout=30.0, follow_redirects=True, headers=STREAM_HEADERS)
+
+    def prefetch(self, repo_urls: List[str]) -> None:
+        # Pages are fetched per repo; nothing to batch.
+        pass
+
+    def close(self) -> None:
+        if self.client is not None:
+            self.client.close()
 
     def fetch_snapshot(self, repo_url: str) -> RepositorySnapshot:
+        if self.client is not None:
+            return self._stream_snapshot(repo_url)
+
         response = self.fetcher.get(repo_url)
         html = getattr(response, "text", "") or ""
 
-        stars = self._extract_social_count(html, "stargazers")
-        forks = self._extract_social_count(html, "forks")
+        stars = extract_social_count(html, "stargazers")
+        forks = extract_social_count(html, "forks")
 
         owner, name = parse_owner_repo(repo_url)
         return RepositorySnapshot(
             repo_url=repo_url,
             captured_at=datetime.now(timezone.utc),
-            default_branch=self._extract_default_branch(html),
+            default_branch=extract_default_branch(html),
             stars=stars,
             forks=forks,
             open_issues=None,
-            latest_release_tag=self._extract_latest_release_tag(html),
+            latest_release_tag=extract_latest_release_tag(html),
             raw_payload_ref=f"inline:{len(html)}chars:{owner}/{name}",
         )
 
     def fetch_releases(self, repo_url: str) -> List[ReleaseEvent]:
-        owner, name = parse_owner_repo(repo_url)
         releases_url = repo_url.rstrip("/") + "/releases"
+        if self.client is not None:
+            return self._stream_releases(repo_url, releases_url)
+
         response = self.fetcher.get(releases_url)
         html = getattr(response, "text", "") or ""
 
@@ -60,50 +100,48 @@ class GitHubScraplingIngestor:
             if source_url in seen:
                 continue
             seen.add(source_url)
-
-            event = ReleaseEvent(
-                repo_url=repo_url,
-                version=tag,
-                published_at=self._extract_first_datetime(html),
-                title=f"Release {tag}",
-                notes_url=source_url,
-                source_url=source_url,
-                is_security_relevant=("security" in tag.lower()),
-            )
-            events.append(event)
+            events.append(self._release_event(repo_url, tag, href, extract_first_datetime(html)))
 
         # keep this bounded for runtime and noise
-        return events[:10]
-
-    def _extract_latest_release_tag(self, html: str) -> str | None:
-        m = RELEASE_CARD_RE.search(html)
-        return m.group("tag") if m else None
-
-    def _extract_first_datetime(self, html: str) -> datetime | None:
-        m = ISO_TS_RE.search(html)
-        if not m:
-            return None
-        raw = m.group("dt").replace("Z", "+00:00")
-        try:
-            return datetime.fromisoformat(raw)
-        except ValueError:
-            return None
-
-    def _extract_social_count(self, html: str, keyword: str) -> int | None:
-        idx = html.find(keyword)
-        if idx == -1:
-            return None
-        window = html[max(0, idx - 200): idx + 200]
-        m = META_COUNT_RE.search(window)
-        if not m:
-            return None
-        try:
-            return int(m.group(1).replace(",", ""))
-        except ValueError:
-            return None
-
-    def _extract_default_branch(self, html: str) -> str | None:
-        for branch in ("main", "master", "dev"):
-            if f"/tree/{branch}" in html:
-                return branch
-        return None
+        return events[:MAX_RELEASES]
+
+    def _stream_snapshot(self, repo_url: str) -> RepositorySnapshot:
+        owner, name = parse_owner_repo(repo_url)
+        extractor = SnapshotExtractor()
+        self._stream(repo_url, extractor)
+        return RepositorySnapshot(
+            repo_url=repo_url,
+            captured_at=datetime.now(timezone.utc),
+            default_branch=extractor.default_branch,
+            stars=extractor.counts["stargazers"],
+            forks=extractor.counts["forks"],
+            open_issues=None,
+            latest_release_tag=extractor.latest_release_tag,
+            raw_payload_ref=f"stream:{extractor.chars_seen}chars:{owner}/{name}",
+        )
+
+    def _stream_releases(self, repo_url: str, releases_url: str) -> List[ReleaseEvent]:
+        extractor = ReleaseListExtractor(limit=MAX_RELEASES)
+        self._stream(releases_url, extractor)
+        return [
+            self._release_event(repo_url, tag, href, extractor.first_datetime)
+            for tag, href in extractor.releases
+        ]
+
+    def _stream(self, url: str, extractor: IncrementalExtractor) -> None:
+        stats = stream_extract(self.client, url, extractor)
+        self.last_stream_stats = stats
+        if stats["error"] or not 200 <= stats["status"] < 300:
+            print(f"warning: stream fetch failed url={url} status={stats['status']} error={stats['error']}; fields left empty")
+
+    def _release_event(self, repo_url: str, tag: str, href: str, published_at: datetime | None) -> ReleaseEvent:
+        source_url = f"https://github.com{href}"
+        return ReleaseEvent(
+            repo_url=repo_url,
+            version=tag,
+            published_at=published_at,
+            title=f"Release {tag}",
+            notes_url=source_url,
+            source_url=source_url,
+            is_security_relevant=("security" in tag.lower()),
+        )
@@ -1,7 +1,20 @@
 from __future__ import annotations
 
+import re
+from datetime import datetime
 from typing import Optional
 
+RELEASE_CARD_RE = re.compile(
+    r'href="(?P<href>/(?P<owner>[A-Za-z0-9_.-]+)/(?P<repo>[A-Za-z0-9_.-]+)/releases/tag/(?P<tag>[^"]+))"',
+    re.IGNORECASE,
+)
+ISO_TS_RE = re.compile(r"datetime=\"(?P<dt>[^\"]+)\"")
+META_COUNT_RE = re.compile(r"([0-9][0-9,]*)")
+
+# Social counts are read from a fixed window around the first keyword hit.
+SOCIAL_COUNT_WINDOW = 200
+DEFAULT_BRANCH_CANDIDATES = ("main", "master", "dev")
+
 
 def extract_by_markers(html: str, start_marker: str, end_marker: str) -> Optional[str]:
     start = html.find(start_marker)
@@ -12,3 +25,47 @@ def extract_by_markers(html: str, start_marker: str, end_marker: str) -> Optiona
     if end == -1:
         return None
     return html[start:end]
+
+
+def parse_github_datetime(raw: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def extract_latest_release_tag(html: str) -> Optional[str]:
+    m = RELEASE_CARD_RE.search(html)
+    return m.group("tag") if m else None
+
+
+def extract_first_datetime(html: str) -> Optional[datetime]:
+    m = ISO_TS_RE.search(html)
+    if not m:
+        return None
+    return parse_github_datetime(m.group("dt"))
+
+
+def extract_social_count(html: str, keyword: str) -> Optional[int]:
+    idx = html.find(keyword)
+    if idx == -1:
+        return None
+    return count_near(html, idx)
+
+
+def count_near(html: str, idx: int) -> Optional[int]:
+    window = html[max(0, idx - SOCIAL_COUNT_WINDOW): idx + SOCIAL_COUNT_WINDOW]
+    m = META_COUNT_RE.search(window)
+    if not m:
+        return None
+    try:
+        return int(m.group(1).replace(",", ""))
+    except ValueError:
+        return None
+
+
+def extract_default_branch(html: str) -> Optional[str]:
+    for branch in DEFAULT_BRANCH_CANDIDATES:
+        if f"/tree/{branch}" in html:
+            return branch
+    return None
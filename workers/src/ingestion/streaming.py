@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from workers.src.ingestion.selectors import (
+    DEFAULT_BRANCH_CANDIDATES,
+    ISO_TS_RE,
+    RELEASE_CARD_RE,
+    SOCIAL_COUNT_WINDOW,
+    count_near,
+    parse_github_datetime,
+)
+
+_UNSET: Any = object()
+
+
+class IncrementalExtractor(ABC):
+    """Runs the page selectors over a stream of text chunks.
+
+    Only a short tail of already-scanned text is kept (enough for a match or a social-count
+    window to straddle a chunk boundary), so memory stays flat regardless of page size.
+    ``feed`` returns True once every field is resolved and the rest of the body can be skipped.
+    """
+
+    overlap = 4 * SOCIAL_COUNT_WINDOW
+
+    def __init__(self) -> None:
+        self.chars_seen = 0
+        self._buf = ""
+
+    @property
+    @abstractmethod
+    def done(self) -> bool:
+        """True once every field is resolved."""
+
+    def feed(self, chunk: str) -> bool:
+        self._buf += chunk
+        self.chars_seen += len(chunk)
+        self._scan(final=False)
+        if len(self._buf) > self.overlap:
+            self._buf = self._buf[-self.overlap:]
+        return self.done
+
+    def finish(self) -> None:
+        self._scan(final=True)
+
+    @abstractmethod
+    def _scan(self, final: bool) -> None:
+        """Match selectors against the buffered tail; on ``final`` resolve missing fields to None."""
+
+
+class SnapshotExtractor(IncrementalExtractor):
+    """Streaming counterpart of the repo page selectors.
+
+    Unlike ``extract_default_branch`` on a full page, the first ``/tree/<candidate>`` link in
+    the stream wins (the branch selector sits near the top of the page).
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.counts: Dict[str, Optional[int]] = {"stargazers": _UNSET, "forks": _UNSET}
+        self.default_branch: Optional[str] = _UNSET
+        self.latest_release_tag: Optional[str] = _UNSET
+
+    @property
+    def done(self) -> bool:
+        fields = [self.default_branch, self.latest_release_tag, *self.counts.values()]
+        return all(v is not _UNSET for v in fields)
+
+    def _scan(self, final: bool) -> None:
+        buf = self._buf
+        for keyword, value in self.counts.items():
+            if value is not _UNSET:
+                continue
+            idx = buf.find(keyword)
+            # Wait for the full window after the keyword unless the body has ended.
+            if idx != -1 and (final or len(buf) - idx >= SOCIAL_COUNT_WINDOW):
+                self.counts[keyword] = count_near(buf, idx)
+
+        if self.default_branch is _UNSET:
+            hits = [(buf.find(f"/tree/{b}"), b) for b in DEFAULT_BRANCH_CANDIDATES]
+            hits = [h for h in hits if h[0] != -1]
+            if hits:
+                self.default_branch = min(hits)[1]
+
+        if self.latest_release_tag is _UNSET:
+            m = RELEASE_CARD_RE.search(buf)
+            if m:
+                self.latest_release_tag = m.group("tag")
+
+        if final:
+            for keyword, value in self.counts.items():
+                if value is _UNSET:
+                    self.counts[keyword] = None
+            if self.default_branch is _UNSET:
+                self.default_branch = None
+            if self.latest_release_tag is _UNSET:
+                self.latest_release_tag = None
+
+
+class ReleaseListExtractor(IncrementalExtractor):
+    """Collects up to ``limit`` unique release tag links plus the first timestamp on the page."""
+
+    def __init__(self, limit: int = 10) -> None:
+        super().__init__()
+        self.limit = limit
+        self.releases: List[Tuple[str, str]] = []
+        self.first_datetime: Optional[datetime] = _UNSET
+        self._seen: set[str] = set()
+
+    @property
+    def done(self) -> bool:
+        return len(self.releases) >= self.limit and self.first_datetime is not _UNSET
+
+    def _scan(self, final: bool) -> None:
+        buf = self._buf
+        if len(self.releases) < self.limit:
+            for m in RELEASE_CARD_RE.finditer(buf):
+                href = m.group("href")
+                if href in self._seen:
+                    continue
+                self._seen.add(href)
+                self.releases.append((m.group("tag"), href))
+                if len(self.releases) >= self.limit:
+                    break
+
+        if self.first_datetime is _UNSET:
+            m = ISO_TS_RE.search(buf)
+            if m:
+                self.first_datetime = parse_github_datetime(m.group("dt"))
+            elif final:
+                self.first_datetime = None
+
+
+def stream_extract(
+    client: httpx.Client,
+    url: str,
+    extractor: IncrementalExtractor,
+    chunk_size: int = 16384,
+) -> Dict[str, Any]:
+    """GET ``url`` and feed the body into ``extractor``, closing the connection early when done.
+
+    Error statuses and transport errors are not raised: like an empty page on the Scrapling
+    path, the extractor's fields resolve to None and ``status`` / ``error`` say why.
+    """
+    start = time.perf_counter()
+    early_stop = False
+    status: Optional[int] = None
+    error: Optional[str] = None
+    bytes_read = 0
+    try:
+        with client.stream("GET", url) as response:
+            status = response.status_code
+            if response.is_success:
+                for text in response.iter_text(chunk_size):
+                    if extractor.feed(text):
+                        early_stop = True
+                        break
+            bytes_read = response.num_bytes_downloaded
+    except httpx.HTTPError as exc:
+        error = repr(exc)
+    extractor.finish()
+
+    return {
+        "url": url,
+        "status": status,
+        "error": error,
+        "bytes_read": bytes_read,
+        "chars_seen": extractor.chars_seen,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+        "early_stop": early_stop,
+    }
@@ -1,102 +1,287 @@
 from __future__ import annotations
 
+import argparse
+import signal
+import sys
+
 from workers.src.analysis.comparison import build_comparison_run
 from workers.src.analysis.openai_analyzer import OpenAIAnalyzer
-from workers.src.analysis.rank_shift import detect_rank_shifts
+from workers.src.analysis.rank_shift import detect_rank_shifts_from_record
+from workers.src.analysis.run_delta import encode_comparison_run, latest_run_states, next_run_state
 from workers.src.common.config import settings
+from workers.src.common.checkpoint import RunCheckpoint
+from workers.src.common.db import get_conn
+from workers.src.common.idempotency import make_dedupe_key
+from workers.src.common.models import ReleaseEvent, RepositorySnapshot
+from workers.src.common.profiling import PROFILE_FORMATS, RunProfiler
+from workers.src.common.queries import fetch_latest_comparison_runs
 from workers.src.common.store import JsonlStore
+from workers.src.ingestion.base import Ingestor
+from workers.src.ingestion.github_graphql import GitHubGraphQLIngestor
 from workers.src.ingestion.normalize import normalize_releases
 from workers.src.ingestion.persist import persist_comparison_run, persist_repo_batch
 from workers.src.ingestion.scrapling_github import GitHubScraplingIngestor
 from workers.src.notifications import build_rank_shift_notifications
 
 
-def run_ingestion() -> None:
-    ingestor = GitHubScraplingIngestor()
+def _build_ingestor() -> Ingestor:
+    if settings.ingest_backend == "graphql":
+        return GitHubGraphQLIngestor(
+            settings.github_token,
+            batch_size=settings.graphql_batch_size,
+            url=settings.github_graphql_url,
+        )
+    return GitHubScraplingIngestor(streaming=settings.ingest_streaming)
+
+
+def _load_previous_db_runs() -> dict:
+    """Latest full DB run state per mode, used as the base for the next DB delta record."""
+    # Indexed summary-table lookup instead of replaying the run history.
+    with get_conn() as conn:
+        rows = fetch_latest_comparison_runs(conn)
+    return {
+        mode: {
+            "mode": mode,
+            "criteriaWeights": row["criteria_weights"],
+            "repositories": row["repositories"],
+            "results": row["results"],
+            "runsSinceKeyframe": row["runs_since_keyframe"],
+            "keyframeId": row["keyframe_id"],
+        }
+        for mode, row in rows.items()
+    }
+
+
+def _encode_for_store(comparison: dict, previous: dict | None) -> tuple[dict, dict]:
+    """Stored record for `comparison` against one store's previous run, plus that store's new state."""
+    record = encode_comparison_run(comparison, previous)
+    state = next_run_state(previous, record)
+    if record["kind"] == "delta":
+        state["keyframeId"] = previous.get("keyframeId")
+    return record, state
+
+
+def run_ingestion(
+    profile_cpu: bool = False,
+    profile_format: str = "speedscope",
+    profile_interval: float = 0.005,
+    profile_memory: bool = False,
+    resume: bool = True,
+) -> None:
+    ingestor = _build_ingestor()
     analyzer = OpenAIAnalyzer(settings.openai_api_key, settings.openai_model)
-    file_store = JsonlStore()
+    file_store = JsonlStore(
+        buffered=settings.jsonl_buffered,
+        fsync=settings.jsonl_fsync,
+        background=settings.jsonl_background_writer,
+    )
+    profiler = RunProfiler(
+        file_store.base_path / "profiles",
+        cpu=profile_cpu,
+        cpu_format=profile_format,
+        cpu_interval=profile_interval,
+        memory=profile_memory,
+    )
+    profiler.start()
+    try:
+        _run(ingestor, analyzer, file_store, profiler, resume=resume)
+    finally:
+        ingestor.close()
+        file_store.close()
+        for path in profiler.finish():
+            print(f"profile_artifact={path}")
+
+
+def _open_checkpoint(file_store: JsonlStore, resume: bool) -> RunCheckpoint:
+    pending = RunCheckpoint.latest_incomplete(file_store)
+    if pending and resume:
+        dropped = pending.rewind_artifacts()
+        done = sum(1 for url in pending.repo_urls if pending.repo_stage(url, "persisted"))
+        print(
+            f"Resuming run_id={pending.run_id} repos_done={done}/{len(pending.repo_urls)} "
+            f"dropped_uncheckpointed_bytes={sum(dropped.values())}"
+        )
+        return pending
+    if pending:
+        pending.write("abandoned")
+    return RunCheckpoint.start(file_store, settings.repo_urls)
+
+
+def _run(
+    ingestor: Ingestor,
+    analyzer: OpenAIAnalyzer,
+    file_store: JsonlStore,
+    profiler: RunProfiler,
+    resume: bool = True,
+) -> None:
     use_db = bool(settings.database_url)
+    checkpoint = _open_checkpoint(file_store, resume)
 
-    print(f"Starting ingestion for {len(settings.repo_urls)} repositories (db_persistence={use_db})")
+    print(
+        f"Starting ingestion run_id={checkpoint.run_id} for {len(checkpoint.repo_urls)} repositories "
+        f"(db_persistence={use_db})"
+    )
 
     all_analysis_rows = []
+    ingestor.prefetch([url for url in checkpoint.repo_urls if not checkpoint.repo_stage(url, "fetched")])
+
+    for repo_url in checkpoint.repo_urls:
+        analyzed = checkpoint.repo_stage(repo_url, "analyzed")
+        if checkpoint.repo_stage(repo_url, "persisted"):
+            all_analysis_rows.extend(analyzed["analyses"])
+            continue
 
-    for repo_url in settings.repo_urls:
-        snapshot = ingestor.fetch_snapshot(repo_url)
-        releases = ingestor.fetch_releases(repo_url)
-        normalized = normalize_releases(releases)
+        fetched = checkpoint.repo_stage(repo_url, "fetched")
+        with profiler.stage("fetch"):
+            if fetched:
+                snapshot = RepositorySnapshot.model_validate(fetched["snapshot"])
+                releases = [ReleaseEvent.model_validate(r) for r in fetched["releases"]]
+            else:
+                snapshot = ingestor.fetch_snapshot(repo_url)
+                releases = ingestor.fetch_releases(repo_url)
+                checkpoint.write(
+                    "fetched",
+                    repo_url=repo_url,
+                    snapshot=snapshot.model_dump(mode="json"),
+                    releases=[r.model_dump(mode="json") for r in releases],
+                )
+            normalized = normalize_releases(releases)
 
         analyses = []
-        for ev in normalized:
-            result = analyzer.analyze_change(ev.title, ev.body, str(ev.source_url))
-            row = {"repo_url": repo_url, **result.model_dump(mode="json")}
-            analyses.append(row)
-            all_analysis_rows.append(row)
-
-        # Always keep local artifact trail for debugging/audits.
-        file_store.append_model("repository_snapshots", snapshot)
-        for rel in releases:
-            file_store.append_model("release_events", rel)
-        for ev in normalized:
-            file_store.append_model("normalized_events", ev)
-        for a in analyses:
-            file_store.append_raw("change_analyses", a)
-
-        if use_db:
-            result = persist_repo_batch(
-                repo_url,
-                snapshot.model_dump(mode="json"),
-                [r.model_dump(mode="json") for r in releases],
-                analyses,
-            )
-            print(
-                "repo=%s releases_detected=%d normalized_events=%d analyses=%d db_releases=%d db_analyses=%d"
-                % (
+        with profiler.stage("analysis"):
+            if analyzed:
+                analyses = analyzed["analyses"]
+            else:
+                for ev in normalized:
+                    result = analyzer.analyze_change(ev.title, ev.body, str(ev.source_url))
+                    row = {
+                        "repo_url": repo_url,
+                        **result.model_dump(mode="json"),
+                        "dedupe_key": make_dedupe_key(repo_url, str(ev.source_url), result.model),
+                    }
+                    analyses.append(row)
+                checkpoint.write("analyzed", repo_url=repo_url, analyses=analyses)
+        all_analysis_rows.extend(analyses)
+
+        with profiler.stage("persist"):
+            # Always keep local artifact trail for debugging/audits.
+            file_store.append_model("repository_snapshots", snapshot)
+            for rel in releases:
+                file_store.append_model("release_events", rel)
+            for ev in normalized:
+                file_store.append_model("normalized_events", ev)
+            for a in analyses:
+                file_store.append_raw("change_analyses", a)
+
+            if use_db:
+                result = persist_repo_batch(
                     repo_url,
-                    len(releases),
-                    len(normalized),
-                    len(analyses),
-                    result["releases_written"],
-                    result["analyses_written"],
+                    snapshot.model_dump(mode="json"),
+                    [r.model_dump(mode="json") for r in releases],
+                    analyses,
                 )
-            )
-        else:
-            print(
-                "repo=%s snapshot_at=%s releases_detected=%d normalized_events=%d analyses=%d"
-                % (
-                    repo_url,
-                    snapshot.captured_at.isoformat(),
-                    len(releases),
-                    len(normalized),
-                    len(analyses),
+                print(
+                    "repo=%s releases_detected=%d normalized_events=%d analyses=%d db_releases=%d db_analyses=%d"
+                    % (
+                        repo_url,
+                        len(releases),
+                        len(normalized),
+                        len(analyses),
+                        result["releases_written"],
+                        result["analyses_written"],
+                    )
+                )
+            else:
+                print(
+                    "repo=%s snapshot_at=%s releases_detected=%d normalized_events=%d analyses=%d"
+                    % (
+                        repo_url,
+                        snapshot.captured_at.isoformat(),
+                        len(releases),
+                        len(normalized),
+                        len(analyses),
+                    )
                 )
-            )
+            checkpoint.write("persisted", durable_artifacts=True, repo_url=repo_url)
 
     if all_analysis_rows:
-        history = file_store.read_all("comparison_runs")
-        modes = ["executive", "technical", "security", "usecase"]
+        with profiler.stage("comparison"):
+            modes = ["executive", "technical", "security", "usecase"]
+            # Each store's delta chain is encoded against that store's own previous run, so a write
+            # that landed on only one side (failed DB write, DB toggled between runs) never skews the other.
+            previous_jsonl = latest_run_states(file_store.read_all("comparison_runs"))
+            previous_db = _load_previous_db_runs() if use_db else {}
+            compared = checkpoint.compared_modes()
 
-        for mode in modes:
-            comparison = build_comparison_run(mode=mode, rows=all_analysis_rows)
-            previous_same_mode = next((r for r in reversed(history) if r.get("mode") == mode), None)
+            for mode in modes:
+                if mode in compared:
+                    continue
+                comparison = build_comparison_run(mode=mode, rows=all_analysis_rows)
 
-            shifts = []
-            notifications = []
-            if previous_same_mode:
-                shifts = detect_rank_shifts(previous_same_mode.get("results", []), comparison.get("results", []), min_shift=1)
-                notifications = build_rank_shift_notifications(shifts)
+                # Reuse what an interrupted attempt encoded: its DB write may already be committed,
+                # and re-encoding against latest_comparison_runs would diff this run against itself.
+                encoded = checkpoint.mode_stage(mode, "encoded")
+                if encoded:
+                    record, db_record, db_state = encoded["record"], encoded["db_record"], encoded["db_state"]
+                else:
+                    # Keyframe or delta against the previous run; its rows carry previous_rank.
+                    record, _ = _encode_for_store(comparison, previous_jsonl.get(mode))
+                    db_record, db_state = _encode_for_store(comparison, previous_db.get(mode)) if use_db else (None, None)
 
-            comparison["rankShifts"] = shifts
-            comparison["notifications"] = notifications
+                    # The DB is the shared history when enabled, so shifts/notifications follow its record.
+                    shifts = detect_rank_shifts_from_record((db_record or record)["results"], min_shift=1)
+                    record["rankShifts"] = shifts
+                    record["notifications"] = build_rank_shift_notifications(shifts)
+                    record["run_id"] = checkpoint.run_id
+                    checkpoint.write("encoded", mode=mode, record=record, db_record=db_record, db_state=db_state)
+                if use_db and db_record is None:
+                    # DB enabled since the interrupted attempt, so none of this run is in it yet.
+                    db_record, db_state = _encode_for_store(comparison, previous_db.get(mode))
+                shifts, notifications = record["rankShifts"], record["notifications"]
 
-            file_store.append_raw("comparison_runs", comparison)
-            if use_db:
-                persist_comparison_run(mode, comparison)
+                file_store.append_raw("comparison_runs", record)
+                if use_db:
+                    persist_comparison_run(mode, db_record, db_state, dedupe_key=make_dedupe_key(checkpoint.run_id, mode))
+                checkpoint.write("compared", durable_artifacts=True, mode=mode)
+
+                print(
+                    f"comparison_run mode={mode} kind={record['kind']} db_kind={db_record['kind'] if db_record else None} "
+                    f"repos={len(comparison['repositories'])} "
+                    f"stored_rows={len(record['results'])} shifts={len(shifts)} notifications={len(notifications)}"
+                )
+
+    checkpoint.write("completed")
+    if isinstance(ingestor, GitHubGraphQLIngestor):
+        print(
+            f"graphql requests={ingestor.requests} cost={ingestor.cost_spent} "
+            f"rate_limit_remaining={ingestor.rate_limit.get('remaining')}"
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run one ClawsTrack ingestion + analysis pass.")
+    parser.add_argument("--profile-cpu", action="store_true", help="sample stacks per pipeline stage")
+    parser.add_argument("--profile-format", choices=PROFILE_FORMATS, default="speedscope")
+    parser.add_argument("--profile-interval-ms", type=float, default=5.0)
+    parser.add_argument("--profile-memory", action="store_true", help="tracemalloc diffs at stage boundaries")
+    parser.add_argument(
+        "--no-resume",
+        dest="resume",
+        action="store_false",
+        help="abandon an unfinished run instead of resuming it",
+    )
+    args = parser.parse_args(argv)
 
-            print(
-                f"comparison_run mode={mode} repos={len(comparison['repositories'])} shifts={len(shifts)} notifications={len(notifications)}"
-            )
+    # Turn SIGTERM (deploys, container stops) into a normal exit so buffered rows get flushed.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(143))
+    run_ingestion(
+        profile_cpu=args.profile_cpu,
+        profile_format=args.profile_format,
+        profile_interval=args.profile_interval_ms / 1000,
+        profile_memory=args.profile_memory,
+        resume=args.resume,
+    )
 
 
 if __name__ == "__main__":
-    run_ingestion()
+    main()